@@ -1,6 +1,10 @@
 import pandas as pd
 import streamlit as st
 import altair as alt
+from Streamlit.render_utils import (
+    paginate, top_n, downsample_phases, render_altair,
+    TOP_N_SKILLS, TOP_N_ROLES, MAX_PHASE_BARS, MAX_ALERTS,
+)
 
 def show_multi_rfp_dashboard(results, uploaded_files):
     """
@@ -24,11 +28,11 @@ def show_multi_rfp_dashboard(results, uploaded_files):
 
     # ---- Executive Summary ----
     st.subheader("📋 Executive Summary")
-    for r in filtered_results:
+    for r in paginate(filtered_results, key="dashboard_summary_page"):
         summary = f"""
         **{r['RFP_File']}**
         - Project Type: {r.get('Project_Type', 'N/A')}
-        - Total Budget: {r.get('Cost_Estimate', {}).get('Amount', 'N/A')} INR
+        - Total Budget: {r.get('Cost_Estimate', {}).get('Amount', 'N/A')} {r.get('Cost_Estimate', {}).get('Currency', 'INR')}
         - Total Duration: {r.get('Timeline', {}).get('Total_Duration_Days', 'N/A')} Days
         - Number of Skills: {len(r.get('Required_Skills', []))}
         - Number of Roles: {len(r.get('Tasks_Roles', []))}
@@ -46,15 +50,14 @@ def show_multi_rfp_dashboard(results, uploaded_files):
     if budget_data:
         df_budget = pd.DataFrame(budget_data)
         df_budget["Alert"] = df_budget["Budget"].apply(lambda x: "⚠️ High" if x > 1000000 else "✅ Normal")
-        chart = alt.Chart(df_budget).mark_bar().encode(
+        st.markdown("**💰 Budget Comparison**")
+        render_altair("budget", df_budget, lambda: alt.Chart(df_budget).mark_bar().encode(
             x=alt.X("RFP", sort=None),
             y=alt.Y("Budget"),
             color=alt.Color("Alert:N", scale=alt.Scale(domain=["⚠️ High", "✅ Normal"],
                                                        range=["red", "green"])),
             tooltip=["RFP", "Budget", "Alert"]
-        ).properties(width=700, height=400).interactive()
-        st.markdown("**💰 Budget Comparison**")
-        st.altair_chart(chart, use_container_width=True)
+        ).properties(width=700, height=400).interactive())
 
     # ---- Timeline / Phase Comparison ----
     timeline_rows = []
@@ -67,16 +70,17 @@ def show_multi_rfp_dashboard(results, uploaded_files):
                 "Estimated_Budget": phase.get("Estimated_Budget", 0)
             })
     if timeline_rows:
-        df_timeline = pd.DataFrame(timeline_rows)
+        df_timeline = downsample_phases(pd.DataFrame(timeline_rows))
         df_timeline["Alert"] = df_timeline["Duration"].apply(lambda x: "⚠️ Long" if x > 30 else "✅ Normal")
-        chart = alt.Chart(df_timeline).mark_bar().encode(
+        st.markdown("**⏱ Phase Duration Comparison**")
+        if len(timeline_rows) > MAX_PHASE_BARS:
+            st.caption(f"{len(timeline_rows)} phases aggregated by phase name (mean duration); longest {MAX_PHASE_BARS} shown.")
+        render_altair("phases", df_timeline, lambda: alt.Chart(df_timeline).mark_bar().encode(
             x=alt.X('Phase:N', sort=None),
             y='Duration:Q',
             color=alt.Color("Alert:N", scale=alt.Scale(domain=["⚠️ Long", "✅ Normal"], range=["orange", "skyblue"])),
             tooltip=['RFP', 'Phase', 'Duration', 'Estimated_Budget', 'Alert']
-        ).properties(width=700, height=400).interactive()
-        st.markdown("**⏱ Phase Duration Comparison**")
-        st.altair_chart(chart, use_container_width=True)
+        ).properties(width=700, height=400).interactive())
 
     # ---- Skills Overlap ----
     skills_dict = {}
@@ -84,15 +88,15 @@ def show_multi_rfp_dashboard(results, uploaded_files):
         for skill in r.get("Required_Skills", []):
             skills_dict[skill] = skills_dict.get(skill, 0) + 1
     if skills_dict:
-        df_skills = pd.DataFrame(list(skills_dict.items()), columns=["Skill", "Count"]).sort_values(by="Count", ascending=False)
-        chart = alt.Chart(df_skills).mark_bar().encode(
+        df_skills = top_n(pd.DataFrame(list(skills_dict.items()), columns=["Skill", "Count"]),
+                          "Skill", "Count", TOP_N_SKILLS)
+        st.markdown(f"**🛠 Skills Across Selected RFPs** (top {TOP_N_SKILLS})")
+        render_altair("skills", df_skills, lambda: alt.Chart(df_skills).mark_bar().encode(
             x='Count',
             y=alt.Y('Skill', sort='-x'),
             tooltip=['Skill', 'Count'],
             color='Count:N'
-        ).properties(width=700, height=400)
-        st.markdown("**🛠 Skills Across Selected RFPs**")
-        st.altair_chart(chart, use_container_width=True)
+        ).properties(width=700, height=400))
 
     # ---- Roles Overlap ----
     roles_dict = {}
@@ -100,9 +104,10 @@ def show_multi_rfp_dashboard(results, uploaded_files):
         for role in r.get("Tasks_Roles", []):
             roles_dict[role.get("Role")] = roles_dict.get(role.get("Role"), 0) + 1
     if roles_dict:
-        df_roles = pd.DataFrame(list(roles_dict.items()), columns=["Role", "Count"]).sort_values(by="Count", ascending=False)
-        st.markdown("**👥 Roles Across Selected RFPs**")
-        st.table(df_roles)
+        df_roles = top_n(pd.DataFrame(list(roles_dict.items()), columns=["Role", "Count"]),
+                         "Role", "Count", TOP_N_ROLES)
+        st.markdown(f"**👥 Roles Across Selected RFPs** (top {TOP_N_ROLES})")
+        st.dataframe(df_roles, use_container_width=True, hide_index=True)
 
     # ---- Optional Alerts Summary ----
     st.subheader("⚠️ Alerts / Highlights")
@@ -112,7 +117,10 @@ def show_multi_rfp_dashboard(results, uploaded_files):
             if phase.get("Duration_Days", 0) > 30 or phase.get("Estimated_Budget", 0) > 1000000:
                 alerts.append(f"{r['RFP_File']} → {phase.get('Phase')} (Duration: {phase.get('Duration_Days')}, Budget: {phase.get('Estimated_Budget')})")
     if alerts:
-        for a in alerts:
+        for a in alerts[:MAX_ALERTS]:
             st.warning(a)
+        if len(alerts) > MAX_ALERTS:
+            with st.expander(f"Show all {len(alerts)} alerts"):
+                st.write(alerts)
     else:
         st.success("No critical alerts detected.")
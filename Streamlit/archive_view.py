@@ -0,0 +1,72 @@
+import sqlite3
+import pandas as pd
+import streamlit as st
+
+
+def show_archive_search(archive, page_size=20):
+    """
+    Display a filtered, paginated search over the historical RFP archive.
+
+    Args:
+        archive (RFP_Archive | RemoteArchive): Local archive store (utils.archive_store),
+            or the service's archive in thin-client mode (service.client).
+        page_size (int): Results per page.
+    """
+    facets = archive.facets()
+
+    # ---- Filters ----
+    text = st.text_input("Full-text search", placeholder='e.g. kubernetes AND "data privacy"')
+    col1, col2 = st.columns(2)
+    skills = col1.multiselect("Required skills (all of)", facets["skills"])
+    roles = col2.multiselect("Roles (all of)", facets["roles"])
+    project_type = st.text_input("Project type contains")
+
+    col1, col2, col3, col4 = st.columns(4)
+    min_budget = col1.number_input("Min budget (₹)", min_value=0, value=0, step=100000,
+                                   help="₹50L = 5,000,000. USD/EUR budgets are compared after "
+                                        "conversion to INR; other currencies are not budget-filtered.")
+    max_budget = col2.number_input("Max budget (₹, 0 = any)", min_value=0, value=0, step=100000)
+    min_duration = col3.number_input("Min duration (days)", min_value=0, value=0)
+    max_duration = col4.number_input("Max duration (days, 0 = any)", min_value=0, value=0)
+
+    filters = dict(
+        text=text or None, skills=skills, roles=roles, project_type=project_type or None,
+        min_budget=min_budget or None, max_budget=max_budget or None,
+        min_duration=min_duration or None, max_duration=max_duration or None,
+    )
+
+    # ---- Pagination ----
+    page = st.session_state.get("archive_page", 1)
+    if st.session_state.get("archive_filters") != filters:
+        page = 1  # new query -> back to first page
+    st.session_state["archive_filters"] = filters
+
+    try:
+        result = archive.search(page=page, page_size=page_size, **filters)
+    except (sqlite3.OperationalError, ValueError) as e:
+        st.error(f"Invalid search query: {e}")
+        return
+
+    total_pages = max(1, -(-result["total"] // page_size))
+    page = min(page, total_pages)
+    st.session_state["archive_page"] = page
+    st.caption(f"{result['total']} matching RFPs · page {page} of {total_pages}")
+
+    if result["results"]:
+        st.dataframe(pd.DataFrame(result["results"]), use_container_width=True, hide_index=True)
+
+        col1, col2, _ = st.columns([1, 1, 6])
+        if col1.button("◀ Prev", disabled=page <= 1):
+            st.session_state["archive_page"] = page - 1
+            st.rerun()
+        if col2.button("Next ▶", disabled=page >= total_pages):
+            st.session_state["archive_page"] = page + 1
+            st.rerun()
+
+        # ---- Detail view (loads one analysis only) ----
+        options = {f"{r['rfp_file']} (#{r['id']})": r["id"] for r in result["results"]}
+        selected = st.selectbox("Show archived analysis:", ["—"] + list(options))
+        if selected != "—":
+            st.json(archive.get(options[selected]))
+    else:
+        st.info("No archived RFPs match these filters.")
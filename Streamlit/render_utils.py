@@ -0,0 +1,99 @@
+import json
+import hashlib
+import pandas as pd
+import streamlit as st
+
+# -----------------------------
+# Settings
+# -----------------------------
+RFPS_PER_PAGE = 5
+TOP_N_SKILLS = 25
+TOP_N_ROLES = 25
+MAX_PHASE_BARS = 40
+MAX_ALERTS = 20
+
+
+# -----------------------------
+# Hashing & Pagination
+# -----------------------------
+def analysis_hash(data):
+    """Stable hash of an analysis (or any JSON-able value), used as a cache key."""
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def paginate(items, key, page_size=RFPS_PER_PAGE):
+    """Return only the items on the selected page, so off-page RFPs are never rendered."""
+    total_pages = max(1, -(-len(items) // page_size))
+    if total_pages == 1:
+        return items
+    page = st.number_input(
+        f"Page (1–{total_pages})", min_value=1, max_value=total_pages, value=1, step=1, key=key
+    )
+    start = (page - 1) * page_size
+    st.caption(f"Showing {start + 1}–{min(start + page_size, len(items))} of {len(items)} RFPs")
+    return items[start:start + page_size]
+
+
+# -----------------------------
+# Aggregation & Downsampling
+# -----------------------------
+def top_n(df, label_col, value_col, n, other_label="Other"):
+    """Keep the n largest rows and fold the rest into a single 'Other' row."""
+    df = df.sort_values(value_col, ascending=False)
+    if len(df) <= n:
+        return df
+    rest = pd.DataFrame({label_col: [f"{other_label} ({len(df) - n})"], value_col: [df[value_col].iloc[n:].sum()]})
+    return pd.concat([df.head(n), rest], ignore_index=True)
+
+
+def downsample_phases(df, max_bars=MAX_PHASE_BARS):
+    """
+    With too many phase rows, aggregate by phase name (mean duration, summed budget,
+    number of RFPs) and keep the longest phases.
+    """
+    if len(df) <= max_bars:
+        return df
+    grouped = df.groupby("Phase", as_index=False).agg(
+        Duration=("Duration", "mean"), Estimated_Budget=("Estimated_Budget", "sum"), RFP=("RFP", "nunique")
+    )
+    grouped["Duration"] = grouped["Duration"].round(1)
+    grouped["RFP"] = grouped["RFP"].astype(str) + " RFPs"
+    return grouped.nlargest(max_bars, "Duration")
+
+
+# -----------------------------
+# Cached Figure Specs
+# -----------------------------
+@st.cache_data(show_spinner=False, max_entries=500)
+def gantt_spec(rfp_hash, _df, title):
+    """Plotly Gantt figure as a dict, cached per analysis hash (the DataFrame is not hashed)."""
+    import plotly.express as px
+
+    df = _df.copy()
+    df["Budget_Label"] = df["Estimated_Budget"].apply(lambda x: f"₹{x:,.0f}")
+    fig = px.timeline(
+        df,
+        x_start="Start_Date",
+        x_end="End_Date",
+        y="Phase",
+        color="Phase",
+        text="Budget_Label",
+        title=title
+    )
+    fig.update_yaxes(autorange="reversed")  # Gantt style
+    fig.update_traces(textposition="inside")  # Show labels inside bars
+    return fig.to_dict()
+
+
+@st.cache_data(show_spinner=False, max_entries=200)
+def _vega_spec(key, _build):
+    return _build().to_dict()
+
+
+def render_altair(name, df, build):
+    """
+    Render an Altair chart from a cached Vega-Lite spec.
+    build() is only called when this (name, df) pair hasn't been rendered before.
+    """
+    spec = _vega_spec(analysis_hash([name, df.to_dict("records")]), build)
+    st.vega_lite_chart(spec, use_container_width=True)
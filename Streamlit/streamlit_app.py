@@ -6,12 +6,54 @@ import json
 import pandas as pd
 import streamlit as st
 import altair as alt
-from analysis.analyzer import analyze_rfp
-from rag.llm_interface import llm_generate
-from rag.retriever import RFP_Retriever
+from analysis.timeline import normalize_portfolio
 from Streamlit.Multi_RFP_ComparisonDashboard import show_multi_rfp_dashboard
+from Streamlit.archive_view import show_archive_search
+from Streamlit.render_utils import analysis_hash, paginate, gantt_spec, render_altair
+from utils.archive_store import RFP_Archive
 from utils.export_utils import export_json, export_pdf, export_excel
 from utils.skills_utils import load_internal_skills, skill_gap_analysis
+from rag.cross_rfp_qa import answer_per_document, build_prompt, comparison_table
+
+# Set PLANGENIE_API_URL to run as a thin client of service/api.py;
+# otherwise analysis and Q&A run in this process.
+API_URL = os.getenv("PLANGENIE_API_URL")
+if API_URL:
+    from service.client import PlanGenieClient, RemoteArchive
+else:
+    from analysis.analyzer import modes_at_least
+    from analysis.dedup import RFP_DedupIndex, analyze_rfp_with_reuse
+    from rag.llm_interface import llm_generate
+    from rag.retriever import RFP_Retriever
+
+
+# -----------------------------
+# Cached Timeline Normalization
+# -----------------------------
+def timeline_payload(analyses):
+    """Only the fields the timeline engine reads, so the cache key stays small."""
+    return json.dumps(
+        [{k: a.get(k) for k in ["RFP_File", "Timeline", "Cost_Estimate"]} for a in analyses],
+        sort_keys=True, default=str
+    )
+
+
+@st.cache_data(show_spinner=False)
+def build_portfolio_timeline(payload):
+    return normalize_portfolio(json.loads(payload))
+
+
+# -----------------------------
+# Shared Archive & Dedup Index
+# -----------------------------
+@st.cache_resource
+def get_archive():
+    return RFP_Archive()
+
+
+@st.cache_resource
+def get_dedup_index():
+    return RFP_DedupIndex()
 
 
 # -----------------------------
@@ -20,6 +62,26 @@ from utils.skills_utils import load_internal_skills, skill_gap_analysis
 st.set_page_config(page_title="📄 RFP Analyzer & Comparator", layout="wide")
 st.title("📄 RFP Analyzer & Multi-RFP Comparison")
 
+# Thin clients browse the service's shared archive; the service archives its own results
+archive = RemoteArchive(PlanGenieClient(API_URL)) if API_URL else get_archive()
+
+# -----------------------------
+# Historical RFP Archive
+# -----------------------------
+with st.expander("📚 Search RFP Archive"):
+    show_archive_search(archive)
+
+# -----------------------------
+# Analysis Mode
+# -----------------------------
+analysis_mode = st.sidebar.radio(
+    "Analysis mode",
+    ["hybrid", "full", "offline"],
+    help="hybrid: fields found locally (title, skills, phases, cost) are prefilled and the LLM fills the rest. "
+         "full: the LLM produces every field. offline: no LLM call (fast, less detailed).",
+    disabled=bool(API_URL),
+)
+
 # -----------------------------
 # File Upload
 # -----------------------------
@@ -29,7 +91,11 @@ uploaded_files = st.file_uploader(
 
 if uploaded_files:
     all_analyses = []
-    retriever = RFP_Retriever()
+    if API_URL:
+        client = PlanGenieClient(API_URL)
+    else:
+        retriever = RFP_Retriever()
+        dedup_index = get_dedup_index()
 
     # -----------------------------
     # Process each RFP
@@ -40,9 +106,26 @@ if uploaded_files:
 
         st.subheader(f"🔎 Analyzing {file_name}...")
         with st.spinner("Analyzing RFP..."):
-            analysis = analyze_rfp(file_name, file_text, llm_generate)
+            if API_URL:
+                analysis = client.analyze(file_name, file_text)
+            else:
+                analysis = analyze_rfp_with_reuse(file_name, file_text, llm_generate, dedup_index,
+                                                  mode=analysis_mode)
             analysis["raw_text"] = file_text  # store for RAG
 
+        # The service archives its own results; a more detailed analysis replaces a less detailed one
+        mode_used = analysis.get("Analysis_Mode", analysis_mode)
+        if not API_URL and not analysis.get("error") and not archive.contains(file_text, modes_at_least(mode_used)):
+            archive.ingest({"RFP_File": file_name, **analysis}, file_text)
+
+        reuse = analysis.get("Reuse")
+        if reuse and reuse["Mode"] == "duplicate":
+            st.info(f"♻️ Near-duplicate of {reuse['Source']} (similarity {reuse['Similarity']}) – reused earlier analysis.")
+        elif reuse and reuse["Mode"] == "amendment":
+            sections = reuse["Changed_Sections"] + [f"{h} (removed)" for h in reuse.get("Removed_Sections", [])]
+            st.info(f"✏️ Amendment of {reuse['Source']} – sections {', '.join(sections)}; "
+                    f"re-analysed only: {', '.join(reuse.get('Updated_Fields', [])) or 'nothing'}")
+
         all_analyses.append({"RFP_File": file_name, **analysis})
 
     # -----------------------------
@@ -54,7 +137,7 @@ if uploaded_files:
 
     # ===== Tab: Overview =====
     with tab_overview:
-        for analysis in all_analyses:
+        for analysis in paginate(all_analyses, key="overview_page"):
             st.markdown("---")
             st.subheader(f"Project Overview: {analysis.get('RFP_File')}")
             st.markdown(f"**Project Type:** {analysis.get('Project_Type', 'N/A')}")
@@ -70,63 +153,49 @@ if uploaded_files:
 
     # ===== Tab: Timeline =====
     with tab_timeline:
-       # ===== Tab: Timeline =====
-     st.subheader("📅 Timeline & Budget Allocation")
+        st.subheader("📅 Timeline & Budget Allocation")
 
-    import plotly.express as px
+        # One normalization pass over the whole portfolio, cached across reruns
+        portfolio_df = build_portfolio_timeline(timeline_payload(all_analyses))
 
-    for analysis in all_analyses:
-        st.markdown(f"### {analysis.get('RFP_File')}")
+        # Only the RFPs on the current page are rendered
+        page_items = paginate(list(enumerate(all_analyses)), key="timeline_page")
 
-        phases = analysis.get("Timeline", {}).get("Phases", [])
-        if phases:
-            df = pd.DataFrame(phases)
+        for rfp_idx, analysis in page_items:
+            st.markdown(f"### {analysis.get('RFP_File')}")
 
-            # Normalize column names
-            if "Start_Date" in df.columns and "End_Date" in df.columns:
-                df["Start_Date"] = pd.to_datetime(df["Start_Date"], errors="coerce")
-                df["End_Date"] = pd.to_datetime(df["End_Date"], errors="coerce")
+            df = portfolio_df[portfolio_df["rfp_idx"] == rfp_idx]
+            if not df.empty:
+                df = df[["Phase", "Start_Date", "End_Date", "Duration_Days",
+                         "Estimated_Budget", "Slack_Days", "Critical"]]
 
                 # ✅ KPI Cards
-                total_budget = df["Estimated_Budget"].sum() if "Estimated_Budget" in df else 0
-                total_duration = df["Duration_Days"].sum() if "Duration_Days" in df else 0
+                total_budget = df["Estimated_Budget"].sum()
+                total_duration = analysis.get("Timeline", {}).get("Total_Duration_Days", df["Duration_Days"].sum())
+                currency = analysis.get("Cost_Estimate", {}).get("Currency", "INR")
 
                 col1, col2 = st.columns(2)
-                col1.metric("💰 Total Estimated Budget", f"₹{total_budget:,.0f}")
+                col1.metric("💰 Total Estimated Budget",
+                            f"₹{total_budget:,.0f}" if currency == "INR" else f"{total_budget:,.0f} {currency}")
                 col2.metric("⏳ Total Duration", f"{total_duration} days")
 
-                # ✅ Format budget column for labels
-                if "Estimated_Budget" in df.columns:
-                    df["Budget_Label"] = df["Estimated_Budget"].apply(
-                        lambda x: f"₹{x:,.0f}"
-                    )
-                else:
-                    df["Budget_Label"] = df["Phase"]
-
-                # ✅ Plotly Gantt Chart with formatted currency labels
-                fig = px.timeline(
-                    df,
-                    x_start="Start_Date",
-                    x_end="End_Date",
-                    y="Phase",
-                    color="Phase",
-                    text="Budget_Label",
-                    title=f"Timeline for {analysis.get('RFP_File')}"
-                )
-                fig.update_yaxes(autorange="reversed")  # Gantt style
-                fig.update_traces(textposition="inside")  # Show labels inside bars
-                st.plotly_chart(fig, use_container_width=True)
-
-            st.write("📊 Budget & Timeline Table")
-            st.table(df)
-        else:
-            st.info("No timeline data available.")
+                # ✅ Plotly Gantt Chart, figure spec cached per analysis hash
+                title = f"Timeline for {analysis.get('RFP_File')}"
+                rfp_hash = analysis_hash([title, df.to_dict("records")])
+                st.plotly_chart(gantt_spec(rfp_hash, df, title), use_container_width=True)
 
+                critical = df.loc[df["Critical"], "Phase"].tolist()
+                st.caption(f"🧭 Critical path: {' → '.join(critical)}")
+
+                st.write("📊 Budget & Timeline Table")
+                st.dataframe(df, use_container_width=True, hide_index=True)
+            else:
+                st.info("No timeline data available.")
 
     # ===== Tab: Roles & Tasks =====
     with tab_roles:
         st.subheader("Roles & Tasks")
-        for analysis in all_analyses:
+        for analysis in paginate(all_analyses, key="roles_page"):
             st.markdown(f"**{analysis.get('RFP_File')}**")
             roles = analysis.get("Tasks_Roles", [])
             if roles:
@@ -139,28 +208,41 @@ if uploaded_files:
     # ===== Tab: Ask Questions (RAG Q&A) =====
     with tab_rag:
         st.subheader("❓ Ask Questions about the RFP(s)")
-        combined_text = "\n\n".join([f"{a['RFP_File']}:\n{a.get('raw_text', '')}" for a in all_analyses])
-        chunks = retriever.chunk_text(combined_text)
-        retriever.build_index(chunks)
+        if not API_URL:
+            # Chunk each RFP separately so chunks never straddle documents
+            retriever.chunk_documents({a["RFP_File"]: a.get("raw_text", "") for a in all_analyses})
+            retriever.build_index(retriever.text_chunks)
+
+        rfp_names = [a["RFP_File"] for a in all_analyses]
+        doc_ids = {a["RFP_File"]: a.get("Doc_Id") for a in all_analyses}
+        mode = st.radio("Search in:", ["All RFPs", "One RFP", "Compare across RFPs"], horizontal=True)
+        selected_rfp = st.selectbox("RFP:", rfp_names) if mode == "One RFP" else None
 
         query = st.text_input("Enter your question:")
-        if query:
-            with st.spinner("Searching and generating answer..."):
-                context_chunks = retriever.query(query, top_k=3)
-                context = "\n\n".join(context_chunks)
-                prompt = f"""
-                You are an AI assistant analyzing multiple RFPs.
-                Answer the question using ONLY the provided context.
+        if query and mode == "Compare across RFPs":
+            with st.spinner("Answering per RFP in parallel..."):
+                if API_URL:
+                    ids = [doc_ids[n] for n in rfp_names if doc_ids.get(n)]
+                    results = client.ask_compare(query, ids, top_k=3) if ids else []
+                else:
+                    results = answer_per_document(query, retriever, llm_generate, top_k=3)
 
-                Context:
-                {context}
+            st.subheader("🧠 Answers by RFP")
+            st.dataframe(comparison_table(results), use_container_width=True, hide_index=True)
 
-                Question:
-                {query}
+            with st.expander("📎 Supporting Context"):
+                for r in results:
+                    st.markdown(f"**{r['RFP_File']}**")
+                    st.write(r["Context"])
 
-                Answer:
-                """
-                answer = llm_generate(prompt, max_tokens=400)
+        elif query:
+            with st.spinner("Searching and generating answer..."):
+                if API_URL:
+                    ids = [doc_ids[selected_rfp]] if selected_rfp else [i for i in doc_ids.values() if i]
+                    answer, context_chunks = client.ask(query, ids, top_k=3)
+                else:
+                    context_chunks = retriever.query(query, top_k=3, rfp_file=selected_rfp)
+                    answer = llm_generate(build_prompt(query, context_chunks, selected_rfp), max_tokens=400)
 
             st.subheader("🧠 AI Answer")
             st.write(answer)
@@ -174,7 +256,10 @@ if uploaded_files:
 
         # ----- Top Metrics Cards -----
         col1, col2, col3, col4 = st.columns(4)
-        total_budget = sum(a.get("Cost_Estimate", {}).get("Amount", 0) for a in all_analyses)
+        # Budgets are converted to INR by fix_budgets; amounts in unknown currencies are left out
+        costs = [a.get("Cost_Estimate", {}) for a in all_analyses]
+        total_budget = sum(c.get("Amount", 0) for c in costs if c.get("Currency", "INR") == "INR")
+        other_currencies = sorted({c["Currency"] for c in costs if c.get("Currency", "INR") != "INR"})
         avg_duration = round(
             sum(a.get("Timeline", {}).get("Total_Duration_Days", 0) for a in all_analyses) / len(all_analyses),
             1
@@ -182,7 +267,8 @@ if uploaded_files:
         total_roles = sum(len(a.get("Tasks_Roles", [])) for a in all_analyses)
         total_skills = len(set(skill for a in all_analyses for skill in a.get("Required_Skills", [])))
 
-        col1.metric("💰 Total Budget (INR)", f"{total_budget:,}")
+        col1.metric("💰 Total Budget (INR)", f"{total_budget:,.0f}",
+                    help=f"Excludes budgets in {', '.join(other_currencies)}" if other_currencies else None)
         col2.metric("⏱ Average Duration (Days)", avg_duration)
         col3.metric("👥 Total Roles", total_roles)
         col4.metric("🛠 Total Skills", total_skills)
@@ -241,7 +327,7 @@ with tab_skills:
             flat.extend([x.strip() for x in s.split(",")])
         return flat
 
-    for analysis in all_analyses:
+    for analysis in paginate(all_analyses, key="skills_page"):
         rfp_file = analysis.get("RFP_File")
         rfp_skills = analysis.get("Required_Skills", [])
 
@@ -280,14 +366,12 @@ with tab_skills:
                     "Status": status_list
                 })
 
-                chart = alt.Chart(df_gap).mark_bar().encode(
+                render_altair("skill_gap", df_gap, lambda: alt.Chart(df_gap).mark_bar().encode(
                     x=alt.X('Skill', sort='-y'),
                     y='count()',
                     color='Status',
                     tooltip=['Skill', 'Status']
-                ).properties(height=300)
-
-                st.altair_chart(chart, use_container_width=True)
+                ).properties(height=300))
 
         else:
             st.info("No skills listed in this RFP.")
\ No newline at end of file
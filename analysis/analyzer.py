@@ -1,7 +1,18 @@
 import json
 import re
-from datetime import datetime
-from rag.llm_interface import llm_generate
+import pandas as pd
+from analysis.pre_extract import normalize_currency, pre_extract, to_inr
+from analysis.timeline import parse_dates, normalize_portfolio, PLACEHOLDER_BUDGET
+
+# Analysis modes, from least to most detailed
+ANALYSIS_MODES = ["offline", "hybrid", "full"]
+
+
+def modes_at_least(mode):
+    """Modes whose results are at least as detailed as mode (unknown modes accept only "full")."""
+    rank = ANALYSIS_MODES.index(mode) if mode in ANALYSIS_MODES else len(ANALYSIS_MODES) - 1
+    return ANALYSIS_MODES[rank:]
+
 
 # -----------------------------
 # JSON Extraction
@@ -30,133 +41,210 @@ def extract_json(text):
 # Date Normalization
 # -----------------------------
 def normalize_dates(phases):
-    for p in phases:
-        for key in ["Start_Date", "End_Date"]:
-            if key in p and p[key]:
-                try:
-                    # Try ISO format first
-                    dt = datetime.strptime(p[key], "%Y-%m-%d")
-                except:
-                    try:
-                        # Try common alternate format
-                        dt = datetime.strptime(p[key], "%d/%m/%Y")
-                    except:
-                        dt = None
-                if dt:
-                    p[key] = dt.strftime("%Y-%m-%d")
-                else:
-                    p[key] = "1970-01-01"  # fallback default
+    """Normalize phase dates to YYYY-MM-DD. Unparseable dates become None (not 1970-01-01)."""
+    if not phases:
+        return phases
+    for key in ["Start_Date", "End_Date"]:
+        parsed = parse_dates(pd.Series([p.get(key) for p in phases], dtype="object"))
+        for p, dt in zip(phases, parsed):
+            if key in p:
+                p[key] = None if pd.isna(dt) else dt.strftime("%Y-%m-%d")
     return phases
 
 
 # -----------------------------
 # Budget Fixing
 # -----------------------------
-def fix_budgets(data):
+def fix_budgets(data, weights=None):
+    """
+    Fill in durations, dates and per-phase budgets via the timeline engine.
+    Use normalize_portfolio directly to fix many RFPs in one pass.
+
+    Amounts in a currency with a known rate are converted to INR; the source
+    amount is kept as Original_Amount/Original_Currency.
+    """
     # Ensure Timeline exists
     if "Timeline" not in data:
         data["Timeline"] = {"Phases": [], "Total_Duration_Days": 0}
     if "Phases" not in data["Timeline"]:
         data["Timeline"]["Phases"] = []
 
-    phases = data["Timeline"]["Phases"]
-
     # Ensure Cost_Estimate exists
-    cost_estimate = data.get("Cost_Estimate", {}).get("Amount", 0)
-    if not cost_estimate or cost_estimate <= 0:
-        cost_estimate = 1_000_000  # placeholder budget
-
-    # Ensure each phase has Duration_Days
-    for p in phases:
-        if "Duration_Days" not in p or not isinstance(p["Duration_Days"], (int, float)):
-            p["Duration_Days"] = 1
-
-    # Normalize dates
-    phases = normalize_dates(phases)
-
-    # Compute total duration
-    total_days = sum(p.get("Duration_Days", 1) for p in phases) or 1
-
-    # Distribute budget across phases
-    for p in phases:
-        p["Estimated_Budget"] = round(cost_estimate * (p["Duration_Days"] / total_days), 2)
-
-    data["Timeline"]["Phases"] = phases
-    data["Timeline"]["Total_Duration_Days"] = total_days
-    data["Cost_Estimate"] = {"Amount": cost_estimate, "Currency": "INR", "Estimated": True}
+    # Amounts may arrive as strings ("2500000"); coerce them the way the timeline engine does
+    cost = data.get("Cost_Estimate", {})
+    cost_estimate = pd.to_numeric(pd.Series([cost.get("Amount", 0)], dtype="object"), errors="coerce").tolist()[0]
+    if not cost_estimate > 0:  # NaN, zero or negative
+        cost, cost_estimate = {}, PLACEHOLDER_BUDGET  # placeholder budget
+    currency = normalize_currency(cost.get("Currency"))
+    data["Cost_Estimate"] = {
+        "Amount": cost_estimate,
+        "Currency": currency,
+        "Estimated": cost.get("Estimated", True),
+    }
+    in_inr = to_inr(cost_estimate, currency)
+    if currency != "INR" and in_inr is not None:
+        data["Cost_Estimate"].update(Amount=in_inr, Currency="INR",
+                                     Original_Amount=cost_estimate, Original_Currency=currency)
+    elif "Original_Amount" in cost:  # already converted earlier (e.g. a patched amendment)
+        data["Cost_Estimate"].update(Original_Amount=cost["Original_Amount"],
+                                     Original_Currency=cost.get("Original_Currency"))
+
+    # Dates, durations, critical path and budget split
+    normalize_portfolio([data], weights=weights)
 
     return data
 
 
 # -----------------------------
-# Main RFP Analysis Function
+# Prompt Building
 # -----------------------------
-def analyze_rfp(file_name, file_text, llm_generate):
-    prompt = f"""
-You are an AI assistant analyzing an RFP document.
-
-Return ONLY a valid JSON object. 
-Do not include explanations, markdown, comments, or text outside JSON.
-
-The JSON must follow this structure:
-
-{{
-  "Project_Type": "...",
-  "Scope": {{
+# JSON template per field, so the prompt can ask for only the fields
+# the local pre-extraction pass did not already fill.
+FIELD_TEMPLATES = {
+    "Project_Type": '''"Project_Type": "..."''',
+    "Scope": '''"Scope": {
     "Objectives": [...],
     "Description": "..."
-  }},
-  "Deliverables": [...],
-  "Required_Skills": [...],
-  "Tasks_Roles": [
-    {{
+  }''',
+    "Deliverables": '''"Deliverables": [...]''',
+    "Required_Skills": '''"Required_Skills": [...]''',
+    "Tasks_Roles": '''"Tasks_Roles": [
+    {
       "Role": "...",
       "Tasks": [...]
-    }}
-  ],
-  "Timeline": {{
+    }
+  ]''',
+    "Timeline": '''"Timeline": {
     "Phases": [
-      {{
+      {
         "Phase": "...",
         "Start_Date": "YYYY-MM-DD",
         "End_Date": "YYYY-MM-DD",
         "Duration_Days": ...,
         "Estimated_Budget": ...
-      }}
+      }
     ],
     "Total_Duration_Days": ...
-  }},
-  "Cost_Estimate": {{
+  }''',
+    "Cost_Estimate": '''"Cost_Estimate": {
     "Amount": ...,
     "Currency": "INR",
     "Estimated": true
-  }},
-  "RFP_File": "{file_name}"
+  }''',
+}
+
+
+# Prefilled fields that are only hints: the LLM still returns the full list
+HINT_FIELDS = ["Required_Skills"]
+
+
+def build_prompt(file_name, file_text, fields, hints=None, excerpt=False):
+    """
+    Prompt asking for the given fields only. excerpt=True marks file_text as a
+    few sections of an RFP: the LLM must not invent values the text doesn't state.
+    """
+    structure = ",\n  ".join([FIELD_TEMPLATES[f] for f in fields] + [f'"RFP_File": "{file_name}"'])
+    rules = []
+    if "Tasks_Roles" in fields:
+        rules.append("No empty task lists. Remove roles with empty tasks.")
+    if excerpt:
+        rules.append("The text is an excerpt. Fill fields only from what it states; "
+                     "use empty lists/strings for anything it does not mention.")
+    elif "Timeline" in fields and "Cost_Estimate" in fields:
+        rules.append("No zero budgets. If missing → distribute placeholder budget of 1,000,000 INR across phases.")
+    if "Timeline" in fields:
+        rules.append("Normalize dates to YYYY-MM-DD.")
+    rules.append("Ensure valid JSON only.")
+    rules += [
+        f"{field} already found in the text: {', '.join(values)}. "
+        f"Include these and add any other {field.replace('_', ' ').lower()} the RFP mentions."
+        for field, values in (hints or {}).items()
+    ]
+    rule_lines = "\n".join(f"- {r}" for r in rules)
+    return f"""
+You are an AI assistant analyzing an RFP document.
+
+Return ONLY a valid JSON object. 
+Do not include explanations, markdown, comments, or text outside JSON.
+
+The JSON must follow this structure:
+
+{{
+  {structure}
 }}
 
 ⚠️ Rules:
-- No empty task lists. Remove roles with empty tasks.
-- No zero budgets. If missing → distribute placeholder budget of 1,000,000 INR across phases.
-- Normalize dates to YYYY-MM-DD.
-- Ensure valid JSON only.
+{rule_lines}
 
 RFP text:
 
 {file_text}
 """
 
-    response = llm_generate(prompt, max_tokens=2000)
-    data = extract_json(response)
 
-    # If JSON extraction failed
-    if isinstance(data, dict) and data.get("error"):
-        return data
+def merge_unique(first, second):
+    """Items of first, then items of second not already present (case-insensitive)."""
+    merged, seen = [], set()
+    for item in list(first) + list(second):
+        key = str(item).strip().lower()
+        if key and key not in seen:
+            merged.append(item)
+            seen.add(key)
+    return merged
+
 
-    # Fix budgets, dates, and empty fields
-    data = fix_budgets(data)
+# -----------------------------
+# Main RFP Analysis Function
+# -----------------------------
+def analyze_rfp(file_name, file_text, llm_generate, mode="hybrid", fields=None):
+    """
+    Analyze an RFP.
+
+    mode="full":    the LLM produces every field.
+    mode="hybrid":  fields found by analysis.pre_extract (title, phases, cost) are
+                    prefilled and the LLM is asked only for the rest. Taxonomy skill
+                    hits are passed as hints and merged with the LLM's skill list,
+                    so skills outside the taxonomy are kept.
+    mode="offline": no LLM call at all; everything comes from pre_extract.
+
+    fields: analyse file_text as an excerpt and return only these fields, without
+    timeline/budget normalization (used to re-analyse amended sections).
+
+    The mode actually used is recorded as "Analysis_Mode".
+    """
+    wanted = [f for f in FIELD_TEMPLATES if fields is None or f in fields]
+    if mode == "offline" or llm_generate is None:
+        mode = "offline"
+        data = pre_extract(file_text, offline=True)
+    else:
+        prefilled = pre_extract(file_text) if mode == "hybrid" else {}
+        if fields is not None:
+            prefilled = {f: v for f, v in prefilled.items() if f in wanted}
+        hints = {f: prefilled.pop(f) for f in HINT_FIELDS if f in prefilled}
+        ask = [f for f in wanted if f not in prefilled]
+
+        response = llm_generate(build_prompt(file_name, file_text, ask, hints, excerpt=fields is not None),
+                                max_tokens=2000)
+        data = extract_json(response)
+
+        # If JSON extraction failed
+        if isinstance(data, dict) and data.get("error"):
+            return data
+
+        data.update(prefilled)
+        for field, values in hints.items():
+            data[field] = merge_unique(values, data.get(field) or [])
+
+    if fields is not None:
+        data = {f: data[f] for f in wanted if f in data}
+    else:
+        # Fix budgets, dates, and empty fields
+        data = fix_budgets(data)
+    data["RFP_File"] = file_name
 
     # Remove roles with empty tasks
     if "Tasks_Roles" in data:
         data["Tasks_Roles"] = [r for r in data["Tasks_Roles"] if r.get("Tasks")]
 
+    data["Analysis_Mode"] = mode
     return data
@@ -0,0 +1,392 @@
+import os
+import re
+import json
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+from analysis.analyzer import FIELD_TEMPLATES, analyze_rfp, fix_budgets, modes_at_least
+from analysis.pre_extract import split_sections
+
+# -----------------------------
+# Settings
+# -----------------------------
+NUM_PERM = 128            # MinHash signature length
+NUM_BANDS = 32            # LSH bands (rows per band = NUM_PERM // NUM_BANDS)
+SHINGLE_SIZE = 5          # words per shingle
+DUPLICATE_THRESHOLD = 0.95  # reuse the earlier analysis outright
+AMENDMENT_THRESHOLD = 0.6   # re-analyse only the changed sections
+
+DEDUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dedup_docs (
+    doc_id          TEXT PRIMARY KEY,
+    rfp_file        TEXT NOT NULL,
+    signature       TEXT NOT NULL,
+    sections        TEXT NOT NULL,
+    analysis_path   TEXT NOT NULL,
+    mode            TEXT NOT NULL DEFAULT 'offline'
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS dedup_buckets (
+    band        INTEGER NOT NULL,
+    band_hash   TEXT NOT NULL,
+    doc_id      TEXT NOT NULL REFERENCES dedup_docs(doc_id),
+    PRIMARY KEY (band, band_hash, doc_id)
+) WITHOUT ROWID;
+"""
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+# -----------------------------
+# Shingling & MinHash
+# -----------------------------
+def _hash32(value):
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=4).digest(), "big")
+
+
+def _permutations(num_perm=NUM_PERM, seed=1):
+    """Deterministic (a, b) pairs for the universal hash family used by MinHash."""
+    a_values, b_values = [], []
+    for i in range(num_perm):
+        digest = hashlib.blake2b(f"{seed}-{i}".encode("utf-8"), digest_size=16).digest()
+        a_values.append(int.from_bytes(digest[:8], "big") % (_MERSENNE_PRIME - 1) + 1)
+        b_values.append(int.from_bytes(digest[8:], "big") % _MERSENNE_PRIME)
+    return list(zip(a_values, b_values))
+
+
+_PERMUTATIONS = _permutations()
+
+# a * h overflows uint64, so a is split at bit 32 and each half is reduced
+# modulo the Mersenne prime separately (2**61 == 1 mod p).
+_A = np.array([a for a, _ in _PERMUTATIONS], dtype=np.uint64)[:, None]
+_A_HI, _A_LO = _A >> np.uint64(32), _A & np.uint64(_MAX_HASH)
+_B = np.array([b for _, b in _PERMUTATIONS], dtype=np.uint64)[:, None]
+_CHUNK = 4096  # shingles per (NUM_PERM x _CHUNK) block, bounds memory on long RFPs
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Lower-cased word shingles, so whitespace and casing changes don't count as edits."""
+    words = re.findall(r"\w+", text.lower())
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _mod_mersenne(x):
+    """x mod 2**61 - 1 for uint64 arrays with x < 2**63."""
+    x = (x & np.uint64(_MERSENNE_PRIME)) + (x >> np.uint64(61))
+    return np.where(x >= _MERSENNE_PRIME, x - np.uint64(_MERSENNE_PRIME), x)
+
+
+def minhash_signature(text):
+    """MinHash over all NUM_PERM permutations at once: min of ((a*h + b) mod p) & 0xFFFFFFFF."""
+    hashes = np.fromiter((_hash32(s) for s in shingles(text)), dtype=np.uint64)
+    signature = np.full(NUM_PERM, _MAX_HASH, dtype=np.uint64)
+    for start in range(0, len(hashes), _CHUNK):
+        h = hashes[start:start + _CHUNK]
+        hi = _A_HI * h  # < 2**61
+        hi = ((hi & np.uint64((1 << 29) - 1)) << np.uint64(32)) + (hi >> np.uint64(29))  # hi * 2**32 mod p
+        x = _mod_mersenne(_mod_mersenne(_A_LO * h) + _mod_mersenne(hi) + _B)
+        signature = np.minimum(signature, (x & np.uint64(_MAX_HASH)).min(axis=1))
+    return signature.tolist()
+
+
+def estimate_similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity between two MinHash signatures."""
+    matches = sum(1 for x, y in zip(sig_a, sig_b) if x == y)
+    return matches / len(sig_a)
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# -----------------------------
+# Section Splitting (for amendments)
+# -----------------------------
+def section_hashes(text):
+    return {heading: content_hash(body) for heading, body in split_sections(text)}
+
+
+def changed_sections(old_hashes, new_text):
+    """Return the sections of new_text that are new or differ from old_hashes."""
+    return [
+        (heading, body) for heading, body in split_sections(new_text)
+        if old_hashes.get(heading) != content_hash(body)
+    ]
+
+
+def removed_sections(old_hashes, new_text):
+    """Headings of old_hashes that no longer appear in new_text."""
+    new_headings = {heading for heading, _ in split_sections(new_text)}
+    return [heading for heading in old_hashes if heading not in new_headings]
+
+
+# Analysis fields each kind of section feeds, matched against the heading
+# (first match wins). Sections that feed no field map to [].
+SECTION_FIELDS = [
+    (("submission", "evaluation", "terms", "condition", "contact", "instruction"), []),
+    (("timeline", "schedule", "phase", "milestone"), ["Timeline"]),
+    (("budget", "cost", "pricing", "price", "payment", "financial"), ["Cost_Estimate"]),
+    (("deliverable",), ["Deliverables"]),
+    (("team", "role", "staff", "responsibilit", "resource"), ["Tasks_Roles"]),
+    (("skill", "requirement", "qualification", "eligibility", "technolog"), ["Required_Skills"]),
+    (("scope", "objective", "overview", "background", "introduction", "summary"), ["Scope", "Tasks_Roles"]),
+    (("preamble", "title"), ["Project_Type"]),
+]
+
+
+def section_fields(heading):
+    """Fields fed by a section, or None if the heading is not recognised."""
+    h = heading.lower()
+    for keywords, fields in SECTION_FIELDS:
+        if any(k in h for k in keywords):
+            return fields
+    return None
+
+
+# -----------------------------
+# LSH Index
+# -----------------------------
+class RFP_DedupIndex:
+    """
+    MinHash/LSH index over processed RFP texts.
+
+    Signatures are split into bands; documents sharing any band bucket become
+    candidates, so a lookup only compares against a handful of documents
+    instead of the whole archive.
+
+    Each entry records the analysis mode that produced it, and lookups can be
+    limited to entries at least as detailed as the mode being requested.
+
+    Documents and band buckets live in SQLite, keyed by (band, band_hash):
+    add() inserts one document's rows instead of rewriting the index, queries
+    read only the candidate buckets, and concurrent writers (sessions, threads,
+    service workers) are serialized by SQLite's write lock.
+    """
+
+    def __init__(self, index_path="data/processed_json/dedup_index.db",
+                 analyses_folder="data/processed_json"):
+        self.index_path = index_path
+        self.analyses_folder = analyses_folder
+        self.rows = NUM_PERM // NUM_BANDS
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+        self.conn.executescript(DEDUP_SCHEMA)
+        columns = [r["name"] for r in self.conn.execute("PRAGMA table_info(dedup_docs)")]
+        if "mode" not in columns:  # entries from before modes were recorded count as offline
+            self.conn.execute("ALTER TABLE dedup_docs ADD COLUMN mode TEXT NOT NULL DEFAULT 'offline'")
+        self._import_legacy_json()
+
+    @property
+    def conn(self):
+        """One connection per thread; sqlite3 connections must not be shared across threads."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.index_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _write(self):
+        """Take SQLite's write lock up front so concurrent writers queue instead of failing."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def _band_keys(self, signature):
+        for band in range(NUM_BANDS):
+            chunk = signature[band * self.rows:(band + 1) * self.rows]
+            yield band, hashlib.blake2b(str(chunk).encode("utf-8"), digest_size=8).hexdigest()
+
+    def _insert_doc(self, conn, doc_id, file_name, signature, sections, analysis_path, mode="offline"):
+        conn.execute(
+            "INSERT OR REPLACE INTO dedup_docs (doc_id, rfp_file, signature, sections, analysis_path, mode) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (doc_id, file_name, json.dumps(signature), json.dumps(sections), analysis_path, mode),
+        )
+        conn.executemany("INSERT OR IGNORE INTO dedup_buckets (band, band_hash, doc_id) VALUES (?, ?, ?)",
+                         [(band, h, doc_id) for band, h in self._band_keys(signature)])
+
+    def _import_legacy_json(self):
+        """One-off migration of the old whole-file JSON index, if present."""
+        legacy = os.path.splitext(self.index_path)[0] + ".json"
+        if not os.path.exists(legacy):
+            return
+        with open(legacy, "r", encoding="utf-8") as f:
+            docs = json.load(f)
+        with self._write() as conn:
+            for doc_id, doc in docs.items():
+                self._insert_doc(conn, doc_id, doc["RFP_File"], doc["signature"],
+                                 doc["sections"], doc["analysis_path"])
+        os.replace(legacy, legacy + ".migrated")
+
+    def add(self, file_name, text, analysis, mode="hybrid", signature=None):
+        """
+        Store an analysis made in the given mode and register its text. Returns the doc id.
+        Pass the signature already computed for query() to avoid hashing the text twice.
+        """
+        doc_id = content_hash(text)
+        if signature is None:
+            signature = minhash_signature(text)
+
+        os.makedirs(self.analyses_folder, exist_ok=True)
+        analysis_path = os.path.join(self.analyses_folder, f"{doc_id[:16]}.json")
+        tmp_path = f"{analysis_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(analysis, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, analysis_path)
+
+        with self._write() as conn:
+            self._insert_doc(conn, doc_id, file_name, signature, section_hashes(text), analysis_path, mode)
+        return doc_id
+
+    def get(self, doc_id):
+        """Stored entry as {"RFP_File", "signature", "sections", "analysis_path", "mode"}, or None."""
+        row = self.conn.execute("SELECT * FROM dedup_docs WHERE doc_id = ?", (doc_id,)).fetchone()
+        if row is None:
+            return None
+        return {"RFP_File": row["rfp_file"], "signature": json.loads(row["signature"]),
+                "sections": json.loads(row["sections"]), "analysis_path": row["analysis_path"],
+                "mode": row["mode"]}
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM dedup_docs").fetchone()[0]
+
+    def query(self, text, threshold=AMENDMENT_THRESHOLD, min_mode="offline", signature=None):
+        """
+        Find the most similar indexed RFP analysed in min_mode or a more detailed mode.
+        Returns (doc_id, similarity) or (None, 0.0) if nothing is above threshold.
+        """
+        modes = modes_at_least(min_mode)
+        in_modes = f"d.mode IN ({', '.join('?' * len(modes))})"
+        doc_id = content_hash(text)
+        if self.conn.execute(f"SELECT 1 FROM dedup_docs d WHERE d.doc_id = ? AND {in_modes}",
+                             [doc_id] + modes).fetchone():
+            return doc_id, 1.0
+
+        if signature is None:
+            signature = minhash_signature(text)
+        keys = list(self._band_keys(signature))
+        where = " OR ".join(["(b.band = ? AND b.band_hash = ?)"] * len(keys))
+        candidates = self.conn.execute(
+            f"SELECT DISTINCT d.doc_id, d.signature FROM dedup_buckets b "
+            f"JOIN dedup_docs d ON d.doc_id = b.doc_id WHERE ({where}) AND {in_modes}",
+            [v for key in keys for v in key] + modes,
+        ).fetchall()
+
+        best_id, best_sim = None, 0.0
+        for cand in candidates:
+            sim = estimate_similarity(signature, json.loads(cand["signature"]))
+            if sim > best_sim:
+                best_id, best_sim = cand["doc_id"], sim
+        if best_sim < threshold:
+            return None, 0.0
+        return best_id, best_sim
+
+    def load_analysis(self, doc_id):
+        with open(self.get(doc_id)["analysis_path"], "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+# -----------------------------
+# Patching Amendments
+# -----------------------------
+def patch_analysis(base, patch, fields):
+    """
+    Replace the given fields of an existing analysis with their re-analysis.
+    Fields missing from patch (e.g. their only section was removed) are cleared.
+    """
+    data = json.loads(json.dumps(base))  # deep copy
+    for field in fields:
+        if field in patch:
+            data[field] = patch[field]
+        else:
+            data.pop(field, None)
+    if "Timeline" in fields:
+        data["Timeline"] = {"Phases": data.get("Timeline", {}).get("Phases", [])}
+    data = fix_budgets(data)
+    if "Tasks_Roles" in data:
+        data["Tasks_Roles"] = [r for r in data["Tasks_Roles"] if r.get("Tasks")]
+    return data
+
+
+# -----------------------------
+# Analysis with Reuse
+# -----------------------------
+def analyze_rfp_with_reuse(file_name, file_text, llm_generate, index=None, mode="hybrid"):
+    """
+    Analyze an RFP, reusing prior analyses of near-duplicates.
+
+    - similarity >= DUPLICATE_THRESHOLD: the earlier analysis is returned as-is.
+    - similarity >= AMENDMENT_THRESHOLD: only the fields fed by changed or removed
+      sections are re-analysed (from every section feeding them) and replace
+      those fields of the earlier analysis. Unrecognised section headings fall
+      back to a full analysis.
+    - otherwise: full analyze_rfp call.
+
+    mode is passed through to analyze_rfp ("full", "hybrid" or "offline"). Only
+    earlier analyses made in the same or a more detailed mode are reused, so an
+    offline result never stands in for a hybrid or full one.
+
+    The returned dict carries a "Reuse" entry describing what happened.
+    """
+    if index is None:
+        index = RFP_DedupIndex()
+    signature = minhash_signature(file_text)
+    doc_id, similarity = index.query(file_text, min_mode=mode, signature=signature)
+
+    if doc_id and similarity >= DUPLICATE_THRESHOLD:
+        data = index.load_analysis(doc_id)
+        data["RFP_File"] = file_name
+        data["Reuse"] = {"Mode": "duplicate", "Source": index.get(doc_id)["RFP_File"],
+                         "Similarity": round(similarity, 3)}
+        return data
+
+    if doc_id:
+        entry = index.get(doc_id)
+        changed = [h for h, _ in changed_sections(entry["sections"], file_text)]
+        removed = removed_sections(entry["sections"], file_text)
+        affected = [section_fields(h) for h in changed + removed]
+        if (changed or removed) and None not in affected:
+            fields = [f for f in FIELD_TEMPLATES if any(f in a for a in affected)]
+            sources = [(h, b) for h, b in split_sections(file_text)
+                       if set(section_fields(h) or []) & set(fields)]
+            if sources:
+                patch = analyze_rfp(file_name, "\n".join(f"{h}\n{b}" for h, b in sources),
+                                    llm_generate, mode=mode, fields=fields)
+            else:
+                patch = {"Analysis_Mode": mode if llm_generate else "offline"}
+            if not patch.get("error"):
+                data = patch_analysis(index.load_analysis(doc_id), patch, fields)
+                data["RFP_File"] = file_name
+                data["Analysis_Mode"] = patch["Analysis_Mode"]
+                data.pop("Reuse", None)
+                index.add(file_name, file_text, data, mode=data["Analysis_Mode"], signature=signature)
+                data["Reuse"] = {"Mode": "amendment", "Source": entry["RFP_File"],
+                                 "Similarity": round(similarity, 3),
+                                 "Changed_Sections": changed, "Removed_Sections": removed,
+                                 "Updated_Fields": fields}
+                return data
+
+    data = analyze_rfp(file_name, file_text, llm_generate, mode=mode)
+    if not data.get("error"):
+        index.add(file_name, file_text, data, mode=data["Analysis_Mode"], signature=signature)
+    return data
@@ -0,0 +1,299 @@
+import re
+import json
+from collections import deque
+
+import pandas as pd
+
+from analysis.timeline import parse_dates
+
+# -----------------------------
+# Settings
+# -----------------------------
+CURRENCY_SYMBOLS = {"₹": "INR", "rs": "INR", "rs.": "INR", "inr": "INR",
+                    "$": "USD", "usd": "USD", "€": "EUR", "eur": "EUR"}
+# Approximate rates used to bring every budget to INR for comparison and totals
+INR_PER_UNIT = {"INR": 1.0, "USD": 83.0, "EUR": 90.0}
+MULTIPLIERS = {"k": 1e3, "thousand": 1e3, "l": 1e5, "lac": 1e5, "lakh": 1e5, "lakhs": 1e5,
+               "cr": 1e7, "crore": 1e7, "crores": 1e7, "m": 1e6, "mn": 1e6, "million": 1e6}
+UNIT_DAYS = {"day": 1, "week": 7, "month": 30, "year": 365}
+TOTAL_COST_HINTS = ("total", "budget", "contract value", "estimated cost", "project cost")
+TIMELINE_HEADINGS = ("timeline", "schedule", "phase", "milestone")
+
+
+# -----------------------------
+# Section Splitting
+# -----------------------------
+_HEADING = re.compile(r"^\s*(?:\d+(?:\.\d+)*\.?\s+\S.*|[A-Z][\w &/()-]{1,60}:\s*)$")
+
+
+def split_sections(text):
+    """
+    Split an RFP into (heading, body) sections.
+    Headings are numbered lines ("3. Scope of Work") or short "Label:" lines.
+    """
+    sections = []
+    heading, body = "Preamble", []
+    for line in text.splitlines():
+        if _HEADING.match(line):
+            if body or heading != "Preamble":
+                sections.append((heading, "\n".join(body).strip()))
+            heading, body = line.strip().rstrip(":"), []
+        else:
+            body.append(line)
+    sections.append((heading, "\n".join(body).strip()))
+    return [s for s in sections if s[0] != "Preamble" or s[1]]
+
+
+def _bullets(body):
+    return [line.strip().lstrip("-•*").strip().rstrip(".") for line in body.splitlines()
+            if line.strip().startswith(("-", "•", "*"))]
+
+
+# -----------------------------
+# Money
+# -----------------------------
+_MONEY = re.compile(
+    r"(?P<cur>₹|\$|€|\bINR\b|\bUSD\b|\bEUR\b|\bRs\.?)\s*(?P<num>\d[\d,]*(?:\.\d+)?)\s*"
+    r"(?P<mult>lakhs?|lac|crores?|cr|million|mn|thousand|[klm])?\b"
+    r"|(?P<num2>\d[\d,]*(?:\.\d+)?)\s*(?P<mult2>lakhs?|lac|crores?|cr|million|mn)?\s*(?P<cur2>\bINR\b|\bUSD\b|\bEUR\b)",
+    re.IGNORECASE,
+)
+
+
+def extract_money(text):
+    """All currency amounts as {"Amount", "Currency", "Context"} (Context = the source line)."""
+    results = []
+    for line in text.splitlines():
+        for m in _MONEY.finditer(line):
+            num = m.group("num") or m.group("num2")
+            mult = (m.group("mult") or m.group("mult2") or "").lower()
+            cur = (m.group("cur") or m.group("cur2")).lower()
+            amount = float(num.replace(",", "")) * MULTIPLIERS.get(mult, 1)
+            results.append({"Amount": round(amount, 2), "Currency": CURRENCY_SYMBOLS.get(cur, cur.upper()),
+                            "Context": line.strip()})
+    return results
+
+
+def normalize_currency(value):
+    """Currency code for a symbol or code ("₹", "Rs.", "usd" -> "INR", "INR", "USD"); INR if missing."""
+    value = str(value or "INR").strip()
+    return CURRENCY_SYMBOLS.get(value.lower(), value.upper())
+
+
+def to_inr(amount, currency):
+    """amount converted to INR, or None if the currency has no known rate."""
+    rate = INR_PER_UNIT.get(normalize_currency(currency))
+    return None if rate is None else round(amount * rate, 2)
+
+
+def total_cost(amounts):
+    """Pick the overall budget: an amount on a 'total/budget' line, else the largest (compared in INR)."""
+    if not amounts:
+        return None
+    hinted = [a for a in amounts if any(h in a["Context"].lower() for h in TOTAL_COST_HINTS)]
+    best = max(hinted or amounts, key=lambda a: to_inr(a["Amount"], a["Currency"]) or a["Amount"])
+    return {"Amount": best["Amount"], "Currency": best["Currency"], "Estimated": False}
+
+
+# -----------------------------
+# Dates & Durations
+# -----------------------------
+_DATE = re.compile(
+    r"\b(\d{4}[/-]\d{1,2}[/-]\d{1,2}|\d{1,2}[/-]\d{1,2}[/-]\d{4}"
+    r"|\d{1,2}(?:st|nd|rd|th)?\s+[A-Z][a-z]+\s+\d{4}|[A-Z][a-z]+\s+\d{1,2}(?:st|nd|rd|th)?,\s*\d{4})\b"
+)
+_DURATION = re.compile(r"\b(\d+(?:\.\d+)?)\s*(day|week|month|year)s?\b", re.IGNORECASE)
+_PHASE_LINE = re.compile(
+    r"^[-•*\s]*(?:phase\s*\d+\s*[:\-–]\s*|\d+[.)]\s+)?(?P<name>[^():]+?)\s*(?:\(|:)\s*(?P<num>\d+(?:\.\d+)?)\s*"
+    r"(?P<unit>day|week|month|year)s?\b", re.IGNORECASE,
+)
+
+
+def parse_date(value):
+    """One date in any of timeline.DATE_FORMATS as YYYY-MM-DD, or None."""
+    parsed = parse_dates(pd.Series([value]))[0]
+    return None if pd.isna(parsed) else parsed.strftime("%Y-%m-%d")
+
+
+def extract_dates(text):
+    """Dates keyed by the label that precedes them on the line (e.g. "Issue_Date")."""
+    found = []
+    for line in text.splitlines():
+        for m in _DATE.finditer(line):
+            label = line[:m.start()].strip().rstrip(":").strip() or "Date"
+            found.append((re.sub(r"\W+", "_", label).strip("_") or "Date", m.group(1)))
+    parsed = parse_dates(pd.Series([raw for _, raw in found], dtype="object"))
+
+    dates = {}
+    for (key, _), value in zip(found, parsed):
+        if not pd.isna(value):
+            dates.setdefault(key, value.strftime("%Y-%m-%d"))
+    return dates
+
+
+def to_days(num, unit):
+    return int(round(float(num) * UNIT_DAYS[unit.lower()]))
+
+
+def extract_durations(text):
+    return [{"Days": to_days(m.group(1), m.group(2)), "Context": line.strip()}
+            for line in text.splitlines() for m in _DURATION.finditer(line)]
+
+
+def extract_phases(text):
+    """
+    Phases listed under a Timeline/Schedule heading, written as
+    "Phase 1: Design (2 weeks)", "- Testing (10 days)" or "- Development: 3 months".
+    Durations elsewhere ("- Bid validity (90 days)") are not phases.
+    """
+    phases, in_timeline = [], False
+    for line in text.splitlines():
+        m = _PHASE_LINE.match(line)
+        # numbered phases ("1. Design (2 weeks)") look like headings; keep them inside the section
+        if _HEADING.match(line) and not (in_timeline and m):
+            in_timeline = any(h in line.lower() for h in TIMELINE_HEADINGS)
+        elif in_timeline and m:
+            phases.append({"Phase": m.group("name").strip(" -:"),
+                           "Duration_Days": to_days(m.group("num"), m.group("unit"))})
+    return phases
+
+
+# -----------------------------
+# Skill Matching (Aho–Corasick)
+# -----------------------------
+class SkillMatcher:
+    """
+    Aho–Corasick automaton over a skill taxonomy: finds every known skill in a
+    single pass over the text, regardless of how many skills there are.
+    """
+
+    def __init__(self, skills):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for skill in skills:
+            self._add(skill.lower(), skill)
+        self._build()
+
+    def _add(self, pattern, skill):
+        node = 0
+        for ch in pattern:
+            if ch not in self.goto[node]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+                self.goto[node][ch] = len(self.goto) - 1
+            node = self.goto[node][ch]
+        self.output[node].append((len(pattern), skill))
+
+    def _build(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[child] = self.goto[f].get(ch, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def find(self, text):
+        """Skills found in text, in order of first occurrence, whole words only."""
+        lowered = text.lower()
+        found, node = {}, 0
+        for i, ch in enumerate(lowered):
+            while node and ch not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            for length, skill in self.output[node]:
+                start = i - length + 1
+                before = lowered[start - 1] if start > 0 else " "
+                after = lowered[i + 1] if i + 1 < len(lowered) else " "
+                if not before.isalnum() and not after.isalnum():
+                    found.setdefault(skill, start)
+        return sorted(found, key=found.get)
+
+
+def load_skill_taxonomy(path="data/internal_team_skills.json"):
+    with open(path, "r", encoding="utf-8") as f:
+        taxonomy = json.load(f)
+    return list(taxonomy.keys()) + [s for skills in taxonomy.values() for s in skills]
+
+
+_matcher_cache = {}
+
+
+def skill_matcher(path="data/internal_team_skills.json"):
+    if path not in _matcher_cache:
+        _matcher_cache[path] = SkillMatcher(load_skill_taxonomy(path))
+    return _matcher_cache[path]
+
+
+# -----------------------------
+# Pre-Extraction
+# -----------------------------
+def pre_extract(text, matcher=None, offline=False):
+    """
+    Deterministic first pass over an RFP.
+
+    Returns only the analysis fields it could fill: Project_Type, Required_Skills,
+    Timeline, Cost_Estimate (and Key_Dates). With offline=True it also fills Scope,
+    Deliverables and Tasks_Roles from section bullets, so no LLM call is needed.
+    """
+    data = {}
+
+    title = re.search(r"^\s*(?:Project\s+Title|Project\s+Name|Title)\s*:\s*(.+)$", text, re.IGNORECASE | re.MULTILINE)
+    if title:
+        data["Project_Type"] = title.group(1).strip()
+
+    try:
+        matcher = matcher or skill_matcher()
+        skills = matcher.find(text)
+    except FileNotFoundError:
+        skills = []
+    if skills:
+        data["Required_Skills"] = skills
+
+    phases = extract_phases(text)
+    if phases:
+        data["Timeline"] = {"Phases": phases}
+
+    cost = total_cost(extract_money(text))
+    if cost:
+        data["Cost_Estimate"] = cost
+
+    dates = extract_dates(text)
+    if dates:
+        data["Key_Dates"] = dates
+
+    if offline:
+        _fill_from_sections(data, text)
+
+    return data
+
+
+def _fill_from_sections(data, text):
+    objectives, deliverables, scope_items, requirements = [], [], [], []
+    for heading, body in split_sections(text):
+        h = heading.lower()
+        if "objective" in h:
+            objectives += _bullets(body)
+        elif "deliverable" in h:
+            deliverables += _bullets(body)
+        elif "scope" in h:
+            scope_items += _bullets(body)
+        elif "requirement" in h and "submission" not in h:
+            requirements += _bullets(body)
+
+    data.setdefault("Project_Type", next((l.strip() for l in text.splitlines() if l.strip()), "N/A"))
+    data["Scope"] = {"Objectives": objectives or scope_items, "Description": "; ".join(scope_items)}
+    data["Deliverables"] = deliverables or scope_items
+    data.setdefault("Required_Skills", requirements)
+    tasks = scope_items or deliverables
+    data["Tasks_Roles"] = [{"Role": "Vendor", "Tasks": tasks}] if tasks else []
+    if "Timeline" not in data:
+        durations = extract_durations(text)
+        phases = [{"Phase": "Project", "Duration_Days": max(d["Days"] for d in durations)}] if durations else []
+        data["Timeline"] = {"Phases": phases}
+    return data
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from analysis.analyzer import analyze_rfp, fix_budgets
+from analysis.timeline import PLACEHOLDER_BUDGET
+
+
+def analysis(amount):
+    return {"Timeline": {"Phases": [{"Phase": "Design", "Duration_Days": 10},
+                                    {"Phase": "Testing", "Duration_Days": 10}]},
+            "Cost_Estimate": {"Amount": amount, "Currency": "INR", "Estimated": False}}
+
+
+# -----------------------------
+# Budgets
+# -----------------------------
+@pytest.mark.parametrize("amount, expected", [
+    ("2500000", 2_500_000),
+    (2500000, 2_500_000),
+    (12.5, 12.5),
+    ("50L", PLACEHOLDER_BUDGET),
+    (None, PLACEHOLDER_BUDGET),
+    (0, PLACEHOLDER_BUDGET),
+    (-10, PLACEHOLDER_BUDGET),
+])
+def test_fix_budgets_coerces_numeric_strings(amount, expected):
+    data = fix_budgets(analysis(amount))
+    assert data["Cost_Estimate"]["Amount"] == expected
+    assert sum(p["Estimated_Budget"] for p in data["Timeline"]["Phases"]) == pytest.approx(expected)
+    json.dumps(data)  # no numpy scalars leak into the result
+
+
+def test_foreign_budgets_are_converted_to_inr():
+    data = analysis(50_000)
+    data["Cost_Estimate"]["Currency"] = "$"
+    cost = fix_budgets(data)["Cost_Estimate"]
+    assert cost == {"Amount": 50_000 * 83.0, "Currency": "INR", "Estimated": False,
+                    "Original_Amount": 50_000, "Original_Currency": "USD"}
+    assert fix_budgets(data)["Cost_Estimate"] == cost  # idempotent, e.g. when patching amendments
+    assert sum(p["Estimated_Budget"] for p in data["Timeline"]["Phases"]) == pytest.approx(50_000 * 83.0)
+
+
+def test_unknown_currency_is_kept_as_is():
+    data = analysis(1000)
+    data["Cost_Estimate"]["Currency"] = "gbp"
+    assert fix_budgets(data)["Cost_Estimate"] == {"Amount": 1000, "Currency": "GBP", "Estimated": False}
+
+
+def test_placeholder_budget_is_marked_estimated():
+    assert fix_budgets(analysis("N/A"))["Cost_Estimate"]["Estimated"] is True
+    assert fix_budgets(analysis("2500000"))["Cost_Estimate"]["Estimated"] is False
+
+
+def test_analyze_rfp_keeps_string_amount_from_llm():
+    def llm(prompt, max_tokens=500):
+        return json.dumps({"Project_Type": "Portal",
+                           "Timeline": {"Phases": [{"Phase": "Build", "Duration_Days": 30}]},
+                           "Cost_Estimate": {"Amount": "2500000", "Currency": "INR"}})
+
+    data = analyze_rfp("rfp.txt", "Build a portal.", llm, mode="full")
+    assert data["Cost_Estimate"]["Amount"] == 2_500_000
+    assert data["Timeline"]["Phases"][0]["Estimated_Budget"] == pytest.approx(2_500_000)
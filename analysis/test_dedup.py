@@ -0,0 +1,226 @@
+import json
+import threading
+
+import pytest
+
+from analysis.dedup import (
+    AMENDMENT_THRESHOLD, DUPLICATE_THRESHOLD, RFP_DedupIndex, analyze_rfp_with_reuse,
+    _PERMUTATIONS, _hash32, changed_sections, estimate_similarity, minhash_signature, section_hashes,
+    shingles,
+)
+
+
+STRUCTURED = ["Scope of Work", "Required Skills", "Project Timeline", "Budget",
+              "Terms and Conditions", "Evaluation Criteria"]
+
+
+def make_rfp(n_sections=10, words=150, changed=(), dropped=(), headings=None):
+    """
+    Deterministic RFP text with numbered sections; sections in `changed` get new
+    wording and sections in `dropped` are left out.
+    """
+    parts = []
+    for s in range(len(headings) if headings else n_sections):
+        if s in dropped:
+            continue
+        tag = "v2" if s in changed else "v1"
+        parts.append(f"{s + 1}. {headings[s] if headings else f'Section {s + 1}'}")
+        parts.append(" ".join(f"s{s}{tag}w{i}" for i in range(words)))
+    return "\n".join(parts)
+
+
+def similarity(a, b):
+    return estimate_similarity(minhash_signature(a), minhash_signature(b))
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = RFP_DedupIndex(str(tmp_path / "dedup.db"), str(tmp_path / "analyses"))
+    yield idx
+    idx.close()
+
+
+class FakeLLM:
+    def __init__(self, skills=("Python",), phases=("Development",)):
+        self.prompts = []
+        self.skills, self.phases = list(skills), list(phases)
+
+    def __call__(self, prompt, max_tokens=500):
+        self.prompts.append(prompt)
+        return json.dumps({
+            "Project_Type": "Portal",
+            "Required_Skills": self.skills,
+            "Tasks_Roles": [{"Role": "Developer", "Tasks": ["Build portal"]}],
+            "Timeline": {"Phases": [{"Phase": p, "Duration_Days": 30} for p in self.phases]},
+            "Cost_Estimate": {"Amount": 100000, "Currency": "INR"},
+        })
+
+
+# -----------------------------
+# MinHash thresholds
+# -----------------------------
+def test_identical_text_has_similarity_one():
+    text = make_rfp()
+    assert similarity(text, text) == 1.0
+
+
+def test_whitespace_and_case_changes_are_duplicates():
+    text = make_rfp()
+    assert similarity(text, "  " + text.upper().replace(" ", "  ")) == 1.0
+
+
+def test_one_word_edit_is_above_duplicate_threshold():
+    text = make_rfp()
+    edited = text.replace("s3v1w40", "changed", 1)
+    assert similarity(text, edited) >= DUPLICATE_THRESHOLD
+
+
+def test_one_rewritten_section_falls_in_amendment_band():
+    sim = similarity(make_rfp(), make_rfp(changed={4}))
+    assert AMENDMENT_THRESHOLD <= sim < DUPLICATE_THRESHOLD
+
+
+def test_unrelated_text_is_below_amendment_threshold():
+    other = " ".join(f"other{i}" for i in range(1500))
+    assert similarity(make_rfp(), other) < AMENDMENT_THRESHOLD
+
+
+def test_vectorized_signature_matches_scalar_formula():
+    # stored signatures must stay comparable with ones computed before vectorization
+    text = make_rfp(n_sections=3, words=40)
+    hashes = [_hash32(s) for s in shingles(text)]
+    expected = [min(((a * h + b) % ((1 << 61) - 1)) & 0xFFFFFFFF for h in hashes) for a, b in _PERMUTATIONS]
+    assert minhash_signature(text) == expected
+    assert minhash_signature("") == [0xFFFFFFFF] * len(_PERMUTATIONS)
+
+
+def test_changed_sections_reports_only_edited_sections():
+    old = section_hashes(make_rfp())
+    changes = changed_sections(old, make_rfp(changed={2, 7}))
+    assert [heading for heading, _ in changes] == ["3. Section 3", "8. Section 8"]
+
+
+# -----------------------------
+# LSH index
+# -----------------------------
+def test_query_finds_exact_and_near_duplicates(index):
+    original = make_rfp()
+    doc_id = index.add("rfp.txt", original, {"Project_Type": "Portal"})
+
+    assert index.query(original) == (doc_id, 1.0)
+    found, sim = index.query(make_rfp(changed={4}))
+    assert found == doc_id and AMENDMENT_THRESHOLD <= sim < 1.0
+    assert index.query(" ".join(f"other{i}" for i in range(1500))) == (None, 0.0)
+
+
+def test_index_persists_across_instances(index, tmp_path):
+    doc_id = index.add("rfp.txt", make_rfp(), {"Project_Type": "Portal"})
+    reopened = RFP_DedupIndex(index.index_path, index.analyses_folder)
+    assert len(reopened) == 1
+    assert reopened.get(doc_id)["RFP_File"] == "rfp.txt"
+    assert reopened.load_analysis(doc_id) == {"Project_Type": "Portal"}
+    reopened.close()
+
+
+def test_concurrent_adds_are_not_lost(index):
+    def add_many(worker):
+        for j in range(5):
+            index.add(f"{worker}-{j}.txt", make_rfp(n_sections=2, words=20) + f" w{worker} d{j}", {})
+
+    threads = [threading.Thread(target=add_many, args=(w,)) for w in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(index) == 30
+
+
+def test_query_ignores_entries_from_less_detailed_modes(index):
+    text = make_rfp()
+    index.add("rfp.txt", text, {}, mode="offline")
+    assert index.query(text, min_mode="hybrid") == (None, 0.0)
+    assert index.query(text, min_mode="offline")[1] == 1.0
+
+
+# -----------------------------
+# Reuse
+# -----------------------------
+def test_duplicate_reuses_analysis_without_llm_call(index):
+    llm = FakeLLM()
+    text = make_rfp()
+    first = analyze_rfp_with_reuse("a.txt", text, llm, index, mode="full")
+    assert "Reuse" not in first and len(llm.prompts) == 1
+
+    again = analyze_rfp_with_reuse("b.txt", text, llm, index, mode="full")
+    assert len(llm.prompts) == 1
+    assert again["Reuse"]["Mode"] == "duplicate"
+    assert again["Reuse"]["Source"] == "a.txt"
+    assert again["RFP_File"] == "b.txt"
+
+
+def test_amendment_replaces_only_fields_of_changed_sections(index):
+    first = analyze_rfp_with_reuse("a.txt", make_rfp(headings=STRUCTURED), FakeLLM(skills=["Java"]),
+                                   index, mode="full")
+    llm = FakeLLM(skills=["Python"], phases=["Development", "Invented"])
+    amended = analyze_rfp_with_reuse("a_v2.txt", make_rfp(headings=STRUCTURED, changed={1}),
+                                     llm, index, mode="full")
+
+    assert amended["Reuse"]["Mode"] == "amendment"
+    assert amended["Reuse"]["Changed_Sections"] == ["2. Required Skills"]
+    assert amended["Reuse"]["Updated_Fields"] == ["Required_Skills"]
+    assert amended["Required_Skills"] == ["Python"]  # replaced, not merged with "Java"
+    assert amended["Timeline"] == first["Timeline"]  # no phases appended
+    assert "s1v2w0" in llm.prompts[-1]
+    assert "s0v1w0" not in llm.prompts[-1]
+    assert '"Timeline"' not in llm.prompts[-1]
+
+
+def test_removed_section_clears_its_fields_without_llm_call(index):
+    analyze_rfp_with_reuse("a.txt", make_rfp(headings=STRUCTURED), FakeLLM(skills=["Java"]), index, mode="full")
+    llm = FakeLLM()
+    amended = analyze_rfp_with_reuse("a_v2.txt", make_rfp(headings=STRUCTURED, dropped={1}),
+                                     llm, index, mode="full")
+
+    assert llm.prompts == []
+    assert amended["Reuse"]["Removed_Sections"] == ["2. Required Skills"]
+    assert "Required_Skills" not in amended
+    assert amended["Project_Type"] == "Portal"
+
+
+def test_changes_to_sections_feeding_no_field_skip_the_llm(index):
+    first = analyze_rfp_with_reuse("a.txt", make_rfp(headings=STRUCTURED), FakeLLM(), index, mode="full")
+    llm = FakeLLM()
+    amended = analyze_rfp_with_reuse("a_v2.txt", make_rfp(headings=STRUCTURED, changed={4}),
+                                     llm, index, mode="full")
+
+    assert llm.prompts == []
+    assert amended["Reuse"]["Updated_Fields"] == []
+    assert amended["Required_Skills"] == first["Required_Skills"]
+
+
+def test_unrecognised_changed_section_falls_back_to_full_analysis(index):
+    llm = FakeLLM()
+    analyze_rfp_with_reuse("a.txt", make_rfp(), llm, index, mode="full")
+    again = analyze_rfp_with_reuse("a_v2.txt", make_rfp(changed={4}), llm, index, mode="full")
+
+    assert "Reuse" not in again and len(llm.prompts) == 2
+    assert "s0v1w0" in llm.prompts[-1]
+
+
+def test_signature_is_computed_once_per_miss(index, monkeypatch):
+    import analysis.dedup as dedup
+    calls = []
+    monkeypatch.setattr(dedup, "minhash_signature", lambda text: calls.append(text) or minhash_signature(text))
+    analyze_rfp_with_reuse("a.txt", make_rfp(), FakeLLM(), index, mode="full")
+    assert len(calls) == 1
+
+
+def test_offline_result_is_not_reused_for_hybrid(index):
+    llm = FakeLLM()
+    text = make_rfp()
+    analyze_rfp_with_reuse("a.txt", text, llm, index, mode="offline")
+    assert llm.prompts == []
+
+    hybrid = analyze_rfp_with_reuse("a.txt", text, llm, index, mode="hybrid")
+    assert "Reuse" not in hybrid and len(llm.prompts) == 1
+    assert hybrid["Analysis_Mode"] == "hybrid"
@@ -0,0 +1,138 @@
+import pytest
+
+from analysis.pre_extract import (
+    SkillMatcher, extract_dates, extract_money, extract_phases, parse_date, pre_extract,
+    split_sections, to_inr, total_cost,
+)
+
+SAMPLE = """Project Title: Smart Parking System
+Issue Date: 5th March 2025
+Submission Deadline: 30/04/2025
+1. Scope of Work
+- Mobile app for drivers
+- Admin dashboard
+2. Requirements
+- IoT sensor integration
+- Payment gateway
+3. Timeline
+- Phase 1: Design (2 weeks)
+- Phase 2: Development (3 months)
+4. Terms
+- Bid validity (90 days)
+- Warranty (12 months)
+5. Budget
+Total budget: ₹50 lakh, with ₹5 lakh reserved for support.
+"""
+
+
+# -----------------------------
+# Aho–Corasick skill matching
+# -----------------------------
+def test_matcher_finds_all_skills_in_order_of_appearance():
+    matcher = SkillMatcher(["Python", "Django", "React", "Machine Learning"])
+    text = "Backend in django and PYTHON; machine learning models; React frontend."
+    assert matcher.find(text) == ["Django", "Python", "Machine Learning", "React"]
+
+
+def test_matcher_requires_whole_words():
+    matcher = SkillMatcher(["Java", "SQL", "C"])
+    assert matcher.find("JavaScript and NoSQL only") == []
+    assert matcher.find("Java, SQL and C.") == ["Java", "SQL", "C"]
+
+
+def test_matcher_handles_overlapping_patterns():
+    matcher = SkillMatcher(["Data", "Data Science", "Science"])
+    assert matcher.find("a data science team") == ["Data", "Data Science", "Science"]
+
+
+# -----------------------------
+# Money
+# -----------------------------
+@pytest.mark.parametrize("text, amount, currency", [
+    ("₹50 lakh", 5_000_000, "INR"),
+    ("Rs. 1.2 crore", 12_000_000, "INR"),
+    ("INR 3,00,000", 300_000, "INR"),
+    ("25 lakhs INR", 2_500_000, "INR"),
+    ("$50,000", 50_000, "USD"),
+    ("USD 2.5 million", 2_500_000, "USD"),
+    ("€2.5m", 2_500_000, "EUR"),
+    ("$40k", 40_000, "USD"),
+])
+def test_extract_money(text, amount, currency):
+    (found,) = extract_money(text)
+    assert found["Amount"] == pytest.approx(amount)
+    assert found["Currency"] == currency
+
+
+def test_plain_numbers_are_not_money():
+    assert extract_money("Phase 2 lasts 30 days for 12 users") == []
+
+
+def test_total_cost_prefers_total_line_over_largest_amount():
+    amounts = extract_money("Total: $50,000\nPenalty cap: $80,000\nDesign: $10,000")
+    assert total_cost(amounts) == {"Amount": 50_000, "Currency": "USD", "Estimated": False}
+    assert total_cost(extract_money("Design: $10,000\nBuild: $30,000"))["Amount"] == 30_000
+    assert total_cost([]) is None
+
+
+def test_total_cost_compares_amounts_in_inr():
+    amounts = extract_money("Licences: $50,000\nServices: ₹20 lakh")
+    assert total_cost(amounts)["Currency"] == "USD"  # $50,000 ≈ ₹41.5 lakh
+    assert to_inr(2, "€") == 180.0
+    assert to_inr(2, "GBP") is None
+
+
+# -----------------------------
+# Dates & phases
+# -----------------------------
+@pytest.mark.parametrize("value", ["2025-03-05", "05/03/2025", "05-03-2025", "5th March 2025",
+                                   "5 Mar 2025", "March 5, 2025", "2025/03/05"])
+def test_parse_date_formats(value):
+    assert parse_date(value) == "2025-03-05"
+
+
+def test_parse_date_rejects_invalid():
+    assert parse_date("31/02/2025") is None
+    assert parse_date("next week") is None
+
+
+def test_extract_dates_keys_by_label():
+    assert extract_dates(SAMPLE) == {"Issue_Date": "2025-03-05", "Submission_Deadline": "2025-04-30"}
+    assert extract_dates("Pre-bid meeting: 2025/04/10\nNo date here") == {"Pre_bid_meeting": "2025-04-10"}
+    assert extract_dates("Deadline: 31/02/2025") == {}
+
+
+def test_phases_only_come_from_timeline_sections():
+    assert extract_phases("- Bid validity (90 days)\n- Warranty (12 months)") == []
+    assert extract_phases(SAMPLE) == [{"Phase": "Design", "Duration_Days": 14},
+                                      {"Phase": "Development", "Duration_Days": 90}]
+
+
+def test_numbered_and_colon_phase_lines():
+    text = "Project Schedule:\n1. Design (2 weeks)\n- Build: 1 month\n2. Terms\n- Warranty (1 year)"
+    assert extract_phases(text) == [{"Phase": "Design", "Duration_Days": 14},
+                                    {"Phase": "Build", "Duration_Days": 30}]
+
+
+def test_split_sections():
+    headings = [h for h, _ in split_sections(SAMPLE)]
+    assert headings[1:] == ["1. Scope of Work", "2. Requirements", "3. Timeline", "4. Terms", "5. Budget"]
+
+
+# -----------------------------
+# Pre-extraction
+# -----------------------------
+def test_pre_extract_fills_only_what_it_finds():
+    data = pre_extract(SAMPLE, matcher=SkillMatcher(["IoT", "Payment Gateway"]))
+    assert data["Project_Type"] == "Smart Parking System"
+    assert data["Required_Skills"] == ["IoT", "Payment Gateway"]
+    assert data["Cost_Estimate"] == {"Amount": 5_000_000, "Currency": "INR", "Estimated": False}
+    assert len(data["Timeline"]["Phases"]) == 2
+    assert "Scope" not in data and "Tasks_Roles" not in data
+
+
+def test_pre_extract_offline_fills_every_field():
+    data = pre_extract(SAMPLE, matcher=SkillMatcher([]), offline=True)
+    assert data["Scope"]["Objectives"] == ["Mobile app for drivers", "Admin dashboard"]
+    assert data["Required_Skills"] == ["IoT sensor integration", "Payment gateway"]
+    assert data["Tasks_Roles"] == [{"Role": "Vendor", "Tasks": ["Mobile app for drivers", "Admin dashboard"]}]
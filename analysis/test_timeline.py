@@ -0,0 +1,134 @@
+import pandas as pd
+import pytest
+
+from analysis.timeline import PLACEHOLDER_BUDGET, normalize_portfolio, parse_dates, phase_weights
+
+
+def rfp(phases, amount=None, name="rfp.txt"):
+    analysis = {"RFP_File": name, "Timeline": {"Phases": phases}}
+    if amount is not None:
+        analysis["Cost_Estimate"] = {"Amount": amount}
+    return analysis
+
+
+def by_name(analysis):
+    return {p["Phase"]: p for p in analysis["Timeline"]["Phases"]}
+
+
+# -----------------------------
+# Dates
+# -----------------------------
+def test_parse_dates_accepts_mixed_formats():
+    parsed = parse_dates(pd.Series(["2025-03-05", "05/03/2025", "5th March 2025", "March 5, 2025", "soon", None]))
+    assert (parsed[:4] == pd.Timestamp("2025-03-05")).all()
+    assert parsed[4:].isna().all()
+
+
+# -----------------------------
+# Critical path
+# -----------------------------
+def test_sequential_phases_are_all_critical():
+    analysis = rfp([{"Phase": "Design", "Duration_Days": 10},
+                    {"Phase": "Development", "Duration_Days": 20},
+                    {"Phase": "Testing", "Duration_Days": 5}])
+    normalize_portfolio([analysis], anchor="2025-01-01")
+
+    phases = by_name(analysis)
+    assert phases["Development"]["Start_Date"] == "2025-01-11"
+    assert phases["Testing"]["End_Date"] == "2025-02-05"
+    assert analysis["Timeline"]["Total_Duration_Days"] == 35
+    assert analysis["Timeline"]["Critical_Path"] == ["Design", "Development", "Testing"]
+
+
+def test_parallel_branch_gets_slack():
+    analysis = rfp([{"Phase": "Design", "Duration_Days": 10},
+                    {"Phase": "Backend", "Duration_Days": 3, "Depends_On": ["Design"]},
+                    {"Phase": "Frontend", "Duration_Days": 5, "Depends_On": ["Design"]},
+                    {"Phase": "Launch", "Duration_Days": 2, "Depends_On": ["Backend", "Frontend"]}])
+    normalize_portfolio([analysis], anchor="2025-01-01")
+
+    phases = by_name(analysis)
+    assert phases["Backend"]["Slack_Days"] == 2
+    assert not phases["Backend"]["Critical"]
+    assert phases["Launch"]["Start_Date"] == "2025-01-16"
+    assert analysis["Timeline"]["Total_Duration_Days"] == 17
+    assert analysis["Timeline"]["Critical_Path"] == ["Design", "Frontend", "Launch"]
+
+
+def test_dependency_cycle_falls_back_to_sequential_order():
+    cyclic = rfp([{"Phase": "A", "Duration_Days": 10, "Depends_On": ["B"]},
+                  {"Phase": "B", "Duration_Days": 5, "Depends_On": ["A"]},
+                  {"Phase": "C", "Duration_Days": 3}], name="cyclic.txt")
+    other = rfp([{"Phase": "X", "Duration_Days": 4},
+                 {"Phase": "Y", "Duration_Days": 6, "Depends_On": []}], name="other.txt")
+    df = normalize_portfolio([cyclic, other], anchor="2025-01-01")
+
+    assert (df["Slack_Days"] >= 0).all()
+    phases = by_name(cyclic)
+    assert phases["B"]["Start_Date"] == phases["A"]["End_Date"]
+    assert cyclic["Timeline"]["Total_Duration_Days"] == 18
+    # RFPs without a cycle keep their explicit dependencies
+    assert by_name(other)["Y"]["Start_Date"] == "2025-01-01"
+
+
+def test_passes_are_bounded_by_the_largest_rfp(monkeypatch):
+    import analysis.timeline as timeline
+    passes = []
+    original = timeline._max_passes
+    monkeypatch.setattr(timeline, "_max_passes", lambda df: passes.append(original(df)) or passes[-1])
+
+    portfolio = [rfp([{"Phase": f"P{j}", "Duration_Days": 2} for j in range(4)], name=f"{i}.txt")
+                 for i in range(300)]
+    portfolio.append(rfp([{"Phase": "A", "Duration_Days": 1, "Depends_On": ["B"]},
+                          {"Phase": "B", "Duration_Days": 1, "Depends_On": ["A"]}], name="cyclic.txt"))
+    normalize_portfolio(portfolio, anchor="2025-01-01")
+
+    assert set(passes) == {5}  # 4 phases + 1, not 1202 rows + 1
+    assert portfolio[0]["Timeline"]["Total_Duration_Days"] == 8
+    assert portfolio[-1]["Timeline"]["Total_Duration_Days"] == 2
+
+
+def test_known_start_date_anchors_the_rfp():
+    analysis = rfp([{"Phase": "Design", "Start_Date": "01/03/2025", "Duration_Days": 7},
+                    {"Phase": "Build", "Duration_Days": 14}])
+    normalize_portfolio([analysis], anchor="2020-01-01")
+    assert by_name(analysis)["Build"]["Start_Date"] == "2025-03-08"
+
+
+# -----------------------------
+# Budget allocation
+# -----------------------------
+def test_budget_is_split_by_weight_times_duration():
+    analysis = rfp([{"Phase": "Development", "Duration_Days": 10},
+                    {"Phase": "Training", "Duration_Days": 10}], amount=210000)
+    normalize_portfolio([analysis])
+
+    phases = by_name(analysis)
+    assert phases["Development"]["Estimated_Budget"] == pytest.approx(150000)
+    assert phases["Training"]["Estimated_Budget"] == pytest.approx(60000)
+
+
+def test_custom_weights_override_defaults():
+    weights = phase_weights(pd.Series(["Development", "Support", "Misc"]), {"support": 2.0})
+    assert weights.tolist() == [1.0, 2.0, 1.0]
+
+
+@pytest.mark.parametrize("amount, expected", [
+    (None, PLACEHOLDER_BUDGET),
+    (0, PLACEHOLDER_BUDGET),
+    ("50L", PLACEHOLDER_BUDGET),
+    ("250000", 250000),
+])
+def test_missing_or_unparseable_amounts_use_placeholder(amount, expected):
+    analysis = rfp([{"Phase": "Design", "Duration_Days": 5},
+                    {"Phase": "Testing", "Duration_Days": 5}], amount=amount)
+    normalize_portfolio([analysis])
+    total = sum(p["Estimated_Budget"] for p in analysis["Timeline"]["Phases"])
+    assert total == pytest.approx(expected)
+
+
+def test_empty_portfolio():
+    analysis = {"RFP_File": "empty.txt"}
+    df = normalize_portfolio([analysis])
+    assert df.empty
+    assert analysis["Timeline"] == {"Phases": [], "Total_Duration_Days": 0, "Critical_Path": []}
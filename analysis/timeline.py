@@ -0,0 +1,252 @@
+import pandas as pd
+
+# -----------------------------
+# Settings
+# -----------------------------
+DATE_FORMATS = [
+    "%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%Y/%m/%d",
+    "%d %B %Y", "%d %b %Y", "%B %d, %Y", "%b %d, %Y",
+]
+
+# Budget weight per unit of duration, matched case-insensitively against the phase name.
+# First matching keyword wins; phases that match nothing get weight 1.0.
+DEFAULT_PHASE_WEIGHTS = {
+    "develop": 1.5,
+    "implement": 1.5,
+    "integrat": 1.3,
+    "design": 1.0,
+    "test": 1.0,
+    "deploy": 1.0,
+    "training": 0.6,
+    "maintenance": 0.5,
+    "support": 0.5,
+}
+
+PLACEHOLDER_BUDGET = 1_000_000
+
+
+# -----------------------------
+# Vectorized Date Parsing
+# -----------------------------
+def parse_dates(series, formats=DATE_FORMATS):
+    """
+    Parse a column of date strings trying each format in turn.
+    Each format is applied once to all still-unparsed values; unknown dates stay NaT.
+    """
+    text = series.astype("string").str.strip()
+    text = text.str.replace(r"(\d)(st|nd|rd|th)\b", r"\1", regex=True)
+    parsed = pd.Series(pd.NaT, index=series.index, dtype="datetime64[ns]")
+    for fmt in formats:
+        missing = parsed.isna() & text.notna()
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(text[missing], format=fmt, errors="coerce")
+    return parsed
+
+
+# -----------------------------
+# Portfolio Table
+# -----------------------------
+def phases_frame(analyses):
+    """One row per phase across all analyses, in a single table."""
+    rows = []
+    for rfp_idx, analysis in enumerate(analyses):
+        for phase_idx, p in enumerate(analysis.get("Timeline", {}).get("Phases", [])):
+            rows.append({
+                "rfp_idx": rfp_idx,
+                "phase_idx": phase_idx,
+                "RFP": analysis.get("RFP_File", f"RFP {rfp_idx + 1}"),
+                "Phase": p.get("Phase") or f"Phase {phase_idx + 1}",
+                "Start_Raw": p.get("Start_Date"),
+                "End_Raw": p.get("End_Date"),
+                "Duration_Raw": p.get("Duration_Days"),
+                "Depends_On": p.get("Depends_On"),
+            })
+    columns = ["rfp_idx", "phase_idx", "RFP", "Phase", "Start_Raw", "End_Raw", "Duration_Raw", "Depends_On"]
+    return pd.DataFrame(rows, columns=columns)
+
+
+def _dependency_edges(df):
+    """
+    Edges (row -> dep_row) between phases of the same RFP.
+    Phases with an explicit "Depends_On" list use it (by phase name);
+    otherwise a phase depends on the one before it.
+    """
+    explicit = df["Depends_On"].apply(lambda d: isinstance(d, list))
+
+    sequential = df[~explicit & (df["phase_idx"] > 0)]
+    seq_edges = pd.DataFrame({"row": sequential.index, "dep_row": sequential.index - 1})
+
+    named = df.loc[explicit, ["rfp_idx", "Depends_On"]].explode("Depends_On").dropna()
+    lookup = df.reset_index()[["index", "rfp_idx", "Phase"]].rename(columns={"index": "dep_row"})
+    named = named.reset_index().rename(columns={"index": "row", "Depends_On": "Phase"})
+    named_edges = named.merge(lookup, on=["rfp_idx", "Phase"])[["row", "dep_row"]]
+
+    edges = pd.concat([seq_edges, named_edges], ignore_index=True)
+    return edges[edges["row"] != edges["dep_row"]].drop_duplicates()
+
+
+# -----------------------------
+# Critical Path (CPM)
+# -----------------------------
+def _max_passes(df):
+    """
+    Edges never cross RFPs, so an acyclic chain is at most as long as the
+    largest RFP's phase list; one extra pass detects rows still changing.
+    """
+    return int(df.groupby("rfp_idx").size().max()) + 1
+
+
+def _forward_pass(df, edges):
+    """
+    Earliest starts by repeated edge relaxation. An acyclic chain settles within
+    _max_passes(df) iterations; rows still changing after that sit on a dependency cycle.
+    """
+    duration = df["Duration_Days"]
+    es = pd.Series(0.0, index=df.index)
+    changed = pd.Series(False, index=df.index)
+    for _ in range(_max_passes(df)):
+        ef = es + duration
+        incoming = ef.reindex(edges["dep_row"]).groupby(edges["row"].values).max()
+        new_es = incoming.reindex(df.index).fillna(0.0)
+        changed = new_es != es
+        if not changed.any():
+            break
+        es = new_es
+    return es, changed
+
+
+def _sequential_edges(df, rfp_ids):
+    """Edges that chain the phases of the given RFPs in document order."""
+    rows = df[df["rfp_idx"].isin(rfp_ids) & (df["phase_idx"] > 0)]
+    return pd.DataFrame({"row": rows.index, "dep_row": rows.index - 1})
+
+
+def _critical_path(df, edges):
+    """
+    Forward/backward pass over all RFPs at once.
+    Each iteration relaxes every dependency edge in the portfolio, so the
+    number of iterations is the longest dependency chain, not the phase count.
+
+    RFPs whose Depends_On lists form a cycle fall back to sequential order.
+    """
+    duration = df["Duration_Days"]
+    es, unstable = _forward_pass(df, edges)
+    if unstable.any():
+        cyclic = df.loc[unstable, "rfp_idx"].unique()
+        keep = ~edges["row"].map(df["rfp_idx"]).isin(cyclic)
+        edges = pd.concat([edges[keep], _sequential_edges(df, cyclic)], ignore_index=True)
+        es, _ = _forward_pass(df, edges)
+    ef = es + duration
+
+    finish = ef.groupby(df["rfp_idx"]).transform("max")
+    lf = finish.copy()
+    for _ in range(_max_passes(df)):
+        ls = lf - duration
+        outgoing = ls.reindex(edges["row"]).groupby(edges["dep_row"].values).min()
+        new_lf = outgoing.reindex(df.index).fillna(finish)
+        new_lf = new_lf.where(new_lf < finish, finish)
+        if new_lf.equals(lf):
+            break
+        lf = new_lf
+    ls = lf - duration
+
+    return es, ef, (ls - es)
+
+
+# -----------------------------
+# Budget Allocation
+# -----------------------------
+def phase_weights(phase_names, weights=None):
+    weights = DEFAULT_PHASE_WEIGHTS if weights is None else weights
+    names = phase_names.str.lower()
+    result = pd.Series(float("nan"), index=phase_names.index)
+    for keyword, weight in weights.items():
+        result = result.where(result.notna() | ~names.str.contains(keyword, regex=False), weight)
+    return result.fillna(1.0)
+
+
+# -----------------------------
+# Main Engine
+# -----------------------------
+def normalize_portfolio(analyses, weights=None, anchor=None):
+    """
+    Normalize the timelines of many RFPs in a single pass.
+
+    - parses dates in any of DATE_FORMATS
+    - fills missing durations from dates, and missing dates from durations + dependencies
+    - computes the critical path per RFP (Slack_Days == 0)
+    - allocates each RFP's budget across phases by weight x duration
+
+    The analyses are updated in place; the portfolio table is returned.
+    """
+    df = phases_frame(analyses)
+    anchor = pd.Timestamp(anchor) if anchor is not None else pd.Timestamp.today().normalize()
+
+    for analysis in analyses:
+        analysis.setdefault("Timeline", {}).setdefault("Phases", [])
+
+    if df.empty:
+        for analysis in analyses:
+            analysis["Timeline"]["Total_Duration_Days"] = 0
+            analysis["Timeline"]["Critical_Path"] = []
+        return df
+
+    start = parse_dates(df["Start_Raw"])
+    end = parse_dates(df["End_Raw"])
+
+    # Durations: explicit value, else from dates, else 1 day
+    duration = pd.to_numeric(df["Duration_Raw"], errors="coerce")
+    duration = duration.where(duration > 0, (end - start).dt.days)
+    df["Duration_Days"] = duration.where(duration > 0, 1).astype(int)
+
+    edges = _dependency_edges(df)
+    es, ef, slack = _critical_path(df, edges)
+
+    # Anchor each RFP at the earliest date implied by any known start/end
+    implied = pd.concat([
+        start - pd.to_timedelta(es, unit="D"),
+        end - pd.to_timedelta(ef, unit="D"),
+    ], axis=1).min(axis=1)
+    rfp_anchor = implied.groupby(df["rfp_idx"]).transform("min").fillna(anchor)
+
+    start = start.fillna(rfp_anchor + pd.to_timedelta(es, unit="D"))
+    end = end.fillna(start + pd.to_timedelta(df["Duration_Days"], unit="D"))
+    df["Start_Date"] = start
+    df["End_Date"] = end
+    df["Slack_Days"] = slack.astype(int)
+    df["Critical"] = slack == 0
+
+    # Budget: weight x duration share of each RFP's total
+    # LLM amounts are sometimes strings ("50L", "N/A"); unparseable ones get the placeholder
+    budgets = pd.to_numeric(
+        pd.Series([a.get("Cost_Estimate", {}).get("Amount", 0) for a in analyses], dtype="object"),
+        errors="coerce",
+    )
+    budgets = budgets.where(budgets > 0, PLACEHOLDER_BUDGET)
+    effort = phase_weights(df["Phase"], weights) * df["Duration_Days"]
+    share = effort / effort.groupby(df["rfp_idx"]).transform("sum")
+    df["Estimated_Budget"] = (share * df["rfp_idx"].map(budgets)).round(2)
+
+    _write_back(analyses, df, ef)
+    return df.drop(columns=["Start_Raw", "End_Raw", "Duration_Raw"])
+
+
+def _write_back(analyses, df, ef):
+    totals = ef.groupby(df["rfp_idx"]).max()
+    start_str = df["Start_Date"].dt.strftime("%Y-%m-%d")
+    end_str = df["End_Date"].dt.strftime("%Y-%m-%d")
+
+    for row in df.itertuples():
+        phase = analyses[row.rfp_idx]["Timeline"]["Phases"][row.phase_idx]
+        phase["Start_Date"] = start_str[row.Index]
+        phase["End_Date"] = end_str[row.Index]
+        phase["Duration_Days"] = int(row.Duration_Days)
+        phase["Estimated_Budget"] = float(row.Estimated_Budget)
+        phase["Slack_Days"] = int(row.Slack_Days)
+        phase["Critical"] = bool(row.Critical)
+
+    critical = df[df["Critical"]].groupby("rfp_idx")["Phase"].apply(list)
+    for rfp_idx, analysis in enumerate(analyses):
+        analysis["Timeline"]["Total_Duration_Days"] = int(totals.get(rfp_idx, 0))
+        analysis["Timeline"]["Critical_Path"] = critical.get(rfp_idx, [])
@@ -1,6 +1,6 @@
-import os
 import streamlit as st
 from utils.file_reader import read_pdf, read_docx
+from utils.raw_store import RawDocumentStore
 
 st.title("📄 RFP Analyzer - Upload Your File")
 
@@ -14,39 +14,47 @@ if uploaded_file is not None:
         "size": uploaded_file.size
     })
 
-    # ✅ Clean filename for Windows
-    filename = uploaded_file.name
-    invalid_chars = '<>:"/\\|?*'
-    for c in invalid_chars:
-        filename = filename.replace(c, "_")
-
-    # ✅ Create folder safely
-    save_folder = os.path.join(os.getcwd(), "data", "raw")
-    os.makedirs(save_folder, exist_ok=True)
-
-    # ✅ Full file path
-    file_path = os.path.join(save_folder, filename)
-
-    # ✅ Save the uploaded file
-    with open(file_path, "wb") as f:
-        f.write(uploaded_file.getbuffer())
-
-    st.success(f"File saved at {file_path}")
+    # ✅ Content-addressed store: same content is stored (and extracted) only once,
+    # and different files with the same name never overwrite each other
+    store = RawDocumentStore()
+
+    # ✅ Skip re-hashing the same upload on every Streamlit rerun
+    stored = st.session_state.setdefault("stored_uploads", {})
+    upload_key = getattr(uploaded_file, "file_id", None) or (uploaded_file.name, uploaded_file.size)
+    if upload_key in stored:
+        digest, is_new = stored[upload_key], False
+    else:
+        # ✅ Stream the upload to disk in chunks while hashing it
+        digest, is_new = store.put(uploaded_file, uploaded_file.name)
+        stored[upload_key] = digest
+
+    if is_new:
+        st.success(f"File saved at {store.path(digest)}")
+    else:
+        st.info(f"Already stored ({digest[:12]}…) – reusing existing copy.")
 
     # ✅ Read file safely
     try:
-        if filename.lower().endswith(".pdf"):
-            text = read_pdf(file_path)
-        elif filename.lower().endswith(".docx"):
-            text = read_docx(file_path)
+        name = uploaded_file.name.lower()
+        if name.endswith(".pdf"):
+            reader = read_pdf
+        elif name.endswith(".docx"):
+            reader = read_docx
         else:
             st.error("Unsupported file type!")
-            text = ""
-
-        # Preview first 500 characters
-        if text:
-            st.subheader("🔎 RFP Text Preview:")
-            st.text(text[:500])
+            reader = None
+
+        # ✅ Text is extracted once per content hash (from a memory-mapped file)
+        if reader:
+            if not store.has_text(digest):
+                with st.spinner("Extracting text..."):
+                    store.extract_text(digest, reader)
+
+            # Preview first 500 characters
+            preview = store.preview(digest, 500)
+            if preview:
+                st.subheader("🔎 RFP Text Preview:")
+                st.text(preview)
 
     except Exception as e:
         st.error(f"Error reading file: {e}")
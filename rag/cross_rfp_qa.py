@@ -0,0 +1,43 @@
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+
+
+def build_prompt(question, context_chunks, rfp_file=None):
+    context = "\n\n".join(context_chunks)
+    source = f"the RFP \"{rfp_file}\"" if rfp_file else "multiple RFPs"
+    return f"""
+    You are an AI assistant analyzing {source}.
+    Answer the question using ONLY the provided context.
+    If the context does not contain the answer, reply "Not specified".
+
+    Context:
+    {context}
+
+    Question:
+    {question}
+
+    Answer:
+    """
+
+
+def answer_per_document(question, retriever, llm_generate, top_k=3, max_workers=8, max_tokens=300):
+    """
+    Fan-out Q&A: retrieve top_k chunks from each RFP, then ask the LLM about
+    each RFP in parallel. Returns a list of {"RFP_File", "Answer", "Context"}.
+    """
+    contexts = retriever.query_by_document(question, top_k=top_k)
+
+    def answer_one(item):
+        rfp_file, chunks = item
+        if not chunks:
+            return {"RFP_File": rfp_file, "Answer": "Not specified", "Context": []}
+        answer = llm_generate(build_prompt(question, chunks, rfp_file), max_tokens=max_tokens)
+        return {"RFP_File": rfp_file, "Answer": answer.strip(), "Context": chunks}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(answer_one, contexts.items()))
+
+
+def comparison_table(results):
+    """Merge per-RFP answers into a side-by-side comparison table."""
+    return pd.DataFrame([{"RFP": r["RFP_File"], "Answer": r["Answer"]} for r in results])
@@ -1,5 +1,6 @@
 # retriever_hf_api.py
 from huggingface_hub import InferenceClient
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import os
 from dotenv import load_dotenv
@@ -16,28 +17,70 @@ class RFP_Retriever:
         self.model_name = model_name
         self.index = None
         self.text_chunks = []
+        self.chunk_meta = []      # per chunk: {"RFP_File": ..., "Chunk": ...}
+        self.embeddings = None
 
     def chunk_text(self, text, chunk_size=500):
         words = text.split()
         chunks = [" ".join(words[i:i+chunk_size]) for i in range(0, len(words), chunk_size)]
         self.text_chunks = chunks
+        self.chunk_meta = [{"RFP_File": None, "Chunk": i} for i in range(len(chunks))]
         return chunks
 
-    def embed(self, texts):
-        """Get embeddings from HF API (fully remote)"""
-        embeddings = []
-        for txt in texts:
-            response = self.client.feature_extraction(txt, model=self.model_name)
-            embeddings.append(response)
+    def chunk_documents(self, documents, chunk_size=500):
+        """
+        Chunk each document separately so no chunk straddles two RFPs.
+        Every chunk starts with "<RFP_File>:" so mixed-RFP context stays attributable.
+        documents: dict of RFP_File -> text.
+        """
+        chunks, meta = [], []
+        for rfp_file, text in documents.items():
+            words = text.split()
+            for n, i in enumerate(range(0, len(words), chunk_size)):
+                chunks.append(f"{rfp_file}:\n" + " ".join(words[i:i+chunk_size]))
+                meta.append({"RFP_File": rfp_file, "Chunk": n})
+        self.text_chunks = chunks
+        self.chunk_meta = meta
+        return chunks
+
+    def documents(self):
+        return list(dict.fromkeys(m["RFP_File"] for m in self.chunk_meta))
+
+    def embed(self, texts, max_workers=8):
+        """Get embeddings from HF API (fully remote); requests run in parallel"""
+        def embed_one(txt):
+            return self.client.feature_extraction(txt, model=self.model_name)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            embeddings = list(pool.map(embed_one, texts))
         return np.array(embeddings).astype("float32")
 
     def build_index(self, chunks):
         embeddings = self.embed(chunks)
         import faiss
+        self.embeddings = embeddings
         self.index = faiss.IndexFlatL2(embeddings.shape[1])
         self.index.add(embeddings)
 
-    def query(self, query_text, top_k=3):
+    def _filtered_search(self, query_embedding, rfp_file, top_k):
+        """Exact L2 search restricted to the chunks of one RFP."""
+        ids = np.array([i for i, m in enumerate(self.chunk_meta) if m["RFP_File"] == rfp_file])
+        if len(ids) == 0:
+            return []
+        dists = ((self.embeddings[ids] - query_embedding) ** 2).sum(axis=1)
+        return ids[np.argsort(dists)[:top_k]].tolist()
+
+    def query(self, query_text, top_k=3, rfp_file=None):
+        """Top-k chunks for the query, optionally only from one RFP."""
         query_embedding = self.embed([query_text])
-        D, I = self.index.search(query_embedding, top_k)
+        if rfp_file is not None:
+            return [self.text_chunks[i] for i in self._filtered_search(query_embedding, rfp_file, top_k)]
+        D, I = self.index.search(query_embedding, min(top_k, len(self.text_chunks)))
         return [self.text_chunks[i] for i in I[0]]
+
+    def query_by_document(self, query_text, top_k=3):
+        """Top-k chunks from every RFP for the query (embedded once). Returns {RFP_File: chunks}."""
+        query_embedding = self.embed([query_text])
+        return {
+            rfp_file: [self.text_chunks[i] for i in self._filtered_search(query_embedding, rfp_file, top_k)]
+            for rfp_file in self.documents()
+        }
@@ -0,0 +1,125 @@
+import os
+
+import numpy as np
+
+os.environ.setdefault("Huggingface_API", "test")
+
+from rag.cross_rfp_qa import answer_per_document, comparison_table  # noqa: E402
+from rag.retriever import RFP_Retriever  # noqa: E402
+
+VOCAB = ["budget", "timeline", "security", "cloud"]
+
+DOCUMENTS = {
+    "a.txt": "budget budget a1 a2 a3 timeline a5 a6 a7 a8 a9 a10",
+    "b.txt": "security cloud b2 b3 budget b5",
+}
+
+
+class FakeInferenceClient:
+    """Unit-length bag-of-words embeddings over VOCAB instead of the HF API."""
+
+    def __init__(self):
+        self.calls = []
+
+    def feature_extraction(self, text, model=None):
+        self.calls.append(text)
+        words = text.lower().split()
+        vector = np.array([words.count(term) + 0.01 for term in VOCAB])
+        return (vector / np.linalg.norm(vector)).tolist()
+
+
+def make_retriever(documents=DOCUMENTS, chunk_size=5):
+    retriever = RFP_Retriever()
+    retriever.client = FakeInferenceClient()
+    chunks = retriever.chunk_documents(documents, chunk_size=chunk_size)
+    retriever.build_index(chunks)
+    retriever.client.calls.clear()
+    return retriever
+
+
+def owner(chunk):
+    return chunk.split(":\n", 1)[0]
+
+
+# -----------------------------
+# Chunking
+# -----------------------------
+def test_no_chunk_spans_two_documents():
+    retriever = RFP_Retriever()
+    chunks = retriever.chunk_documents(DOCUMENTS, chunk_size=5)
+
+    assert len(chunks) == 3 + 2  # 12 words -> 3 chunks, 6 words -> 2 chunks
+    for chunk, meta in zip(chunks, retriever.chunk_meta):
+        words = chunk.split(":\n", 1)[1].split()
+        assert owner(chunk) == meta["RFP_File"]
+        assert all(w in DOCUMENTS[meta["RFP_File"]].split() for w in words)
+    assert [m["Chunk"] for m in retriever.chunk_meta] == [0, 1, 2, 0, 1]
+    assert retriever.documents() == ["a.txt", "b.txt"]
+
+
+# -----------------------------
+# Filtered search
+# -----------------------------
+def test_filtered_search_returns_only_that_rfps_chunks():
+    retriever = make_retriever()
+    query = retriever.embed(["budget"])
+
+    ids = retriever._filtered_search(query, "b.txt", top_k=10)
+    assert sorted(ids) == [3, 4]
+    assert "budget" in retriever.text_chunks[ids[0]]  # nearest first
+    assert retriever._filtered_search(query, "missing.txt", top_k=3) == []
+
+
+def test_query_can_be_restricted_to_one_rfp():
+    retriever = make_retriever()
+    assert all(owner(c) == "a.txt" for c in retriever.query("security cloud", top_k=3, rfp_file="a.txt"))
+    assert owner(retriever.query("security cloud", top_k=1)[0]) == "b.txt"
+
+
+def test_query_by_document_embeds_the_question_once():
+    retriever = make_retriever()
+    contexts = retriever.query_by_document("timeline", top_k=2)
+
+    assert retriever.client.calls == ["timeline"]
+    assert list(contexts) == ["a.txt", "b.txt"]
+    assert all(owner(c) == rfp_file for rfp_file, chunks in contexts.items() for c in chunks)
+    assert len(contexts["a.txt"]) == 2 and "timeline" in contexts["a.txt"][0]
+
+
+# -----------------------------
+# Cross-RFP Q&A
+# -----------------------------
+def test_cross_rfp_qa_answers_each_document():
+    retriever = make_retriever()
+    prompts = []
+
+    def llm(prompt, max_tokens=300):
+        prompts.append(prompt)
+        return " a.txt answer " if '"a.txt"' in prompt else "b.txt answer"
+
+    results = answer_per_document("What is the budget?", retriever, llm, top_k=1)
+    assert [r["RFP_File"] for r in results] == ["a.txt", "b.txt"]
+    assert [r["Answer"] for r in results] == ["a.txt answer", "b.txt answer"]
+    assert all(owner(c) == r["RFP_File"] for r in results for c in r["Context"])
+    assert len(prompts) == 2
+    assert comparison_table(results)["RFP"].tolist() == ["a.txt", "b.txt"]
+
+
+def test_empty_context_is_not_specified_without_llm_call():
+    class StubRetriever:
+        def query_by_document(self, question, top_k=3):
+            return {"a.txt": ["a.txt:\nbudget 10 lakh"], "b.txt": []}
+
+    prompts = []
+    results = answer_per_document("Budget?", StubRetriever(), lambda p, max_tokens=300: prompts.append(p) or "10 lakh")
+    assert results == [
+        {"RFP_File": "a.txt", "Answer": "10 lakh", "Context": ["a.txt:\nbudget 10 lakh"]},
+        {"RFP_File": "b.txt", "Answer": "Not specified", "Context": []},
+    ]
+    assert len(prompts) == 1
+
+
+def test_embeddings_are_float32():
+    retriever = make_retriever()
+    assert retriever.embeddings.dtype == np.float32
+    assert retriever.embeddings.shape == (5, len(VOCAB))
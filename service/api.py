@@ -0,0 +1,439 @@
+"""
+PlanGenie HTTP analysis service.
+
+Run with several worker processes (they share the on-disk cache and archive):
+
+    uvicorn service.api:app --host 0.0.0.0 --port 8000 --workers 4
+
+Settings (environment variables):
+    PLANGENIE_CACHE_DIR      shared cache folder            (default: data/service_cache)
+    PLANGENIE_ARCHIVE_DB     shared SQLite archive           (default: data/archive/rfp_archive.db)
+    PLANGENIE_DEDUP_DB       shared near-duplicate index     (default: <cache dir>/dedup_index.db)
+    PLANGENIE_MAX_INFLIGHT   concurrent documents per worker (default: 4)
+    PLANGENIE_MAX_LLM_CALLS  concurrent LLM calls per worker (default: PLANGENIE_MAX_INFLIGHT)
+    PLANGENIE_MAX_BATCH      documents per batch request     (default: 20)
+"""
+import os
+import json
+import asyncio
+import sqlite3
+import hashlib
+import tempfile
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+
+from analysis.analyzer import modes_at_least
+from analysis.dedup import RFP_DedupIndex, analyze_rfp_with_reuse
+from rag.cross_rfp_qa import answer_per_document, build_prompt
+from rag.llm_interface import llm_generate
+from rag.retriever import RFP_Retriever
+from utils.archive_store import RFP_Archive
+from utils.export_utils import export_json, export_pdf, export_excel
+from utils.skills_utils import load_internal_skills, skill_gap_analysis
+
+CACHE_DIR = os.getenv("PLANGENIE_CACHE_DIR", "data/service_cache")
+ARCHIVE_DB = os.getenv("PLANGENIE_ARCHIVE_DB", "data/archive/rfp_archive.db")
+DEDUP_DB = os.getenv("PLANGENIE_DEDUP_DB", os.path.join(CACHE_DIR, "dedup_index.db"))
+MAX_INFLIGHT = int(os.getenv("PLANGENIE_MAX_INFLIGHT", "4"))
+MAX_LLM_CALLS = int(os.getenv("PLANGENIE_MAX_LLM_CALLS", str(MAX_INFLIGHT)))
+MAX_BATCH = int(os.getenv("PLANGENIE_MAX_BATCH", "20"))
+RETRY_AFTER_SECONDS = 5
+
+app = FastAPI(title="PlanGenie RFP Analyzer API")
+
+
+# -----------------------------
+# Request Models
+# -----------------------------
+class Document(BaseModel):
+    file_name: str
+    text: str
+
+
+class BatchRequest(BaseModel):
+    documents: list[Document] = Field(min_length=1)
+
+
+class AskRequest(BaseModel):
+    question: str
+    doc_ids: list[str] = Field(min_length=1)
+    top_k: int = 3
+
+
+class SkillGapRequest(BaseModel):
+    doc_id: str | None = None
+    skills: list[str] | None = None
+
+
+class ExportRequest(BaseModel):
+    doc_ids: list[str] = Field(min_length=1)
+    format: str = "json"
+
+
+class ArchiveSearchRequest(BaseModel):
+    text: str | None = None
+    skills: list[str] = []
+    roles: list[str] = []
+    project_type: str | None = None
+    min_budget: float | None = None
+    max_budget: float | None = None
+    min_duration: float | None = None
+    max_duration: float | None = None
+    page: int = Field(default=1, ge=1)
+    page_size: int = Field(default=20, ge=1, le=100)
+
+
+# -----------------------------
+# Shared On-Disk Cache
+# -----------------------------
+def doc_id_for(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _cache_path(kind, doc_id, ext):
+    folder = os.path.join(CACHE_DIR, kind, doc_id[:2])
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, doc_id + ext)
+
+
+def _atomic_write(path, write):
+    """Write via a temp file + rename so other workers never see a partial file."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _read_json(kind, doc_id):
+    path = _cache_path(kind, doc_id, ".json")
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_json(kind, doc_id, data):
+    payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    _atomic_write(_cache_path(kind, doc_id, ".json"), lambda f: f.write(payload))
+
+
+def _load_doc(doc_id):
+    doc = _read_json("documents", doc_id)
+    if doc is None:
+        raise HTTPException(status_code=404, detail=f"Unknown doc_id {doc_id}; analyze it first.")
+    return doc
+
+
+# -----------------------------
+# Blocking Work (runs in the threadpool)
+# -----------------------------
+_archive = None
+_dedup_index = None
+_llm_slots = threading.BoundedSemaphore(MAX_LLM_CALLS)
+
+
+def _get_archive():
+    global _archive
+    if _archive is None:
+        _archive = RFP_Archive(ARCHIVE_DB)
+    return _archive
+
+
+def _get_dedup_index():
+    global _dedup_index
+    if _dedup_index is None:
+        _dedup_index = RFP_DedupIndex(DEDUP_DB, analyses_folder=os.path.join(CACHE_DIR, "dedup"))
+    return _dedup_index
+
+
+def limited_llm_generate(prompt, **kwargs):
+    """llm_generate, with at most MAX_LLM_CALLS running at once in this worker."""
+    with _llm_slots:
+        return llm_generate(prompt, **kwargs)
+
+
+def analyze_cached(file_name, text):
+    """
+    Analysis with a content-addressed cache shared by every worker.
+    Cache misses go through near-duplicate / amendment reuse before the LLM.
+    """
+    doc_id = doc_id_for(text)
+    cached = _read_json("analyses", doc_id)
+    if cached is not None:
+        return {**cached, "RFP_File": file_name, "Doc_Id": doc_id, "Cached": True}
+
+    analysis = analyze_rfp_with_reuse(file_name, text, limited_llm_generate, _get_dedup_index())
+    if analysis.get("error"):
+        return {**analysis, "Doc_Id": doc_id}
+
+    _write_json("documents", doc_id, {"file_name": file_name, "text": text})
+    _write_json("analyses", doc_id, analysis)
+    archive = _get_archive()
+    if not archive.contains(text, modes_at_least(analysis.get("Analysis_Mode", "hybrid"))):
+        archive.ingest({"RFP_File": file_name, **analysis}, text)
+    return {**analysis, "Doc_Id": doc_id, "Cached": False}
+
+
+def _doc_chunks_and_embeddings(retriever, doc_id):
+    """Chunk embeddings are computed once per document and shared on disk."""
+    emb_path = _cache_path("embeddings", doc_id, ".npy")
+    chunks = _read_json("chunks", doc_id)
+    if chunks is not None and os.path.exists(emb_path):
+        return chunks, np.load(emb_path)
+
+    doc = _load_doc(doc_id)
+    chunks = retriever.chunk_documents({doc["file_name"]: doc["text"]})
+    embeddings = retriever.embed(chunks)
+    _atomic_write(emb_path, lambda f: np.save(f, embeddings))
+    _write_json("chunks", doc_id, chunks)
+    return chunks, embeddings
+
+
+def _load_retriever(doc_ids):
+    """Retriever over the cached chunks and embeddings of several documents."""
+    retriever = RFP_Retriever()
+    all_chunks, all_meta, all_embeddings = [], [], []
+    for doc_id in doc_ids:
+        chunks, embeddings = _doc_chunks_and_embeddings(retriever, doc_id)
+        file_name = _load_doc(doc_id)["file_name"]
+        all_chunks.extend(chunks)
+        all_meta.extend({"RFP_File": file_name, "Chunk": n} for n in range(len(chunks)))
+        all_embeddings.append(embeddings)
+
+    retriever.text_chunks = all_chunks
+    retriever.chunk_meta = all_meta
+    retriever.embeddings = np.vstack(all_embeddings).astype("float32")
+    return retriever
+
+
+def retrieve_context(question, doc_ids, top_k):
+    import faiss
+    retriever = _load_retriever(doc_ids)
+    retriever.index = faiss.IndexFlatL2(retriever.embeddings.shape[1])
+    retriever.index.add(retriever.embeddings)
+    return retriever.query(question, top_k=min(top_k, len(retriever.text_chunks)))
+
+
+def answer_across_documents(question, doc_ids, top_k):
+    """Per-RFP answers, with the LLM calls fanned out inside this worker."""
+    retriever = _load_retriever(doc_ids)
+    return answer_per_document(question, retriever, limited_llm_generate, top_k=top_k,
+                               max_workers=MAX_LLM_CALLS)
+
+
+def answer_question(question, context_chunks, rfp_file=None):
+    return limited_llm_generate(build_prompt(question, context_chunks, rfp_file), max_tokens=400)
+
+
+# -----------------------------
+# Backpressure
+# -----------------------------
+_inflight = 0  # documents in flight in this worker (only touched on the event loop)
+
+
+def check_capacity(weight=1):
+    """
+    Reject instead of queueing when this worker is saturated, so load
+    balancers and clients can retry on another node.
+    """
+    if _inflight + weight > MAX_INFLIGHT:
+        raise HTTPException(
+            status_code=503, detail="Server busy, retry later.",
+            headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+        )
+
+
+class _Slots:
+    """Admission slots held by one request; release() is safe to call twice."""
+
+    def __init__(self, weight=1):
+        global _inflight
+        check_capacity(weight)
+        _inflight += weight
+        self.weight = weight
+
+    def release(self):
+        global _inflight
+        _inflight -= self.weight
+        self.weight = 0
+
+    async def release_async(self):
+        """release() for BackgroundTask: a coroutine runs on the event loop, a plain function in the threadpool."""
+        self.release()
+
+
+@contextmanager
+def admission(weight=1):
+    slots = _Slots(weight)
+    try:
+        yield
+    finally:
+        slots.release()
+
+
+def _ndjson_stream(generator, weight=1):
+    """
+    NDJSON StreamingResponse that holds its admission slots until the stream
+    ends. Slots are taken before the response is returned, so requests
+    arriving meanwhile already see them; the background task releases them
+    even if the stream never starts.
+    """
+    slots = _Slots(weight)
+
+    async def stream():
+        try:
+            async for item in generator:
+                yield item
+        finally:
+            slots.release()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson",
+                             background=BackgroundTask(slots.release_async))
+
+
+def _ndjson(obj):
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+# -----------------------------
+# Endpoints
+# -----------------------------
+@app.get("/health")
+async def health():
+    return {"status": "ok", "inflight": _inflight, "max_inflight": MAX_INFLIGHT}
+
+
+@app.post("/analyze")
+async def analyze(doc: Document):
+    with admission():
+        return await run_in_threadpool(analyze_cached, doc.file_name, doc.text)
+
+
+@app.post("/analyze/batch")
+async def analyze_batch(request: BatchRequest):
+    """
+    Stream one NDJSON line per document as soon as its analysis is ready.
+    A batch holds one slot per document it analyzes concurrently (up to MAX_INFLIGHT).
+    """
+    if len(request.documents) > MAX_BATCH:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH} documents per batch.")
+    weight = min(len(request.documents), MAX_INFLIGHT)
+
+    async def results():
+        limit = asyncio.Semaphore(weight)
+
+        async def run(d):
+            async with limit:
+                return await run_in_threadpool(analyze_cached, d.file_name, d.text)
+
+        tasks = [asyncio.ensure_future(run(d)) for d in request.documents]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield _ndjson(await task)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return _ndjson_stream(results(), weight)
+
+
+@app.post("/ask")
+async def ask(request: AskRequest):
+    """Stream the retrieved context first, then the answer (NDJSON)."""
+    names = [_load_doc(doc_id)["file_name"] for doc_id in request.doc_ids]
+    rfp_file = names[0] if len(names) == 1 else None
+
+    async def events():
+        context_chunks = await run_in_threadpool(
+            retrieve_context, request.question, request.doc_ids, request.top_k
+        )
+        yield _ndjson({"context": context_chunks})
+        answer = await run_in_threadpool(answer_question, request.question, context_chunks, rfp_file)
+        yield _ndjson({"answer": answer})
+
+    return _ndjson_stream(events())
+
+
+@app.post("/ask/compare")
+async def ask_compare(request: AskRequest):
+    """
+    Answer the question separately for each document, in parallel on the server.
+    Returns [{"RFP_File", "Answer", "Context"}, ...]; one request instead of one /ask per RFP.
+    """
+    for doc_id in request.doc_ids:
+        _load_doc(doc_id)
+    with admission(min(len(request.doc_ids), MAX_INFLIGHT)):
+        return await run_in_threadpool(answer_across_documents, request.question, request.doc_ids, request.top_k)
+
+
+@app.post("/skill-gap")
+async def skill_gap(request: SkillGapRequest):
+    if request.skills is not None:
+        skills = request.skills
+    elif request.doc_id:
+        analysis = _read_json("analyses", request.doc_id)
+        if analysis is None:
+            raise HTTPException(status_code=404, detail=f"No analysis for doc_id {request.doc_id}.")
+        skills = analysis.get("Required_Skills", [])
+    else:
+        raise HTTPException(status_code=422, detail="Provide either doc_id or skills.")
+    return skill_gap_analysis(skills, load_internal_skills())
+
+
+@app.post("/export")
+async def export(request: ExportRequest):
+    exporters = {"json": export_json, "pdf": export_pdf, "excel": export_excel}
+    if request.format not in exporters:
+        raise HTTPException(status_code=422, detail=f"format must be one of {list(exporters)}")
+
+    analyses = []
+    for doc_id in request.doc_ids:
+        analysis = _read_json("analyses", doc_id)
+        if analysis is None:
+            raise HTTPException(status_code=404, detail=f"No analysis for doc_id {doc_id}.")
+        analyses.append({"RFP_File": _load_doc(doc_id)["file_name"], **analysis})
+
+    with admission():
+        base_name = "export_" + hashlib.sha256("".join(request.doc_ids).encode()).hexdigest()[:16]
+        output_folder = os.path.join(CACHE_DIR, "exports")
+        save_path = await run_in_threadpool(exporters[request.format], analyses, output_folder, base_name)
+    return FileResponse(save_path, filename=os.path.basename(save_path))
+
+
+@app.post("/archive/search")
+async def archive_search(request: ArchiveSearchRequest):
+    """Filtered, paginated search over the shared archive (see RFP_Archive.search)."""
+    try:
+        return await run_in_threadpool(_get_archive().search, **request.model_dump())
+    except sqlite3.OperationalError as e:  # malformed FTS5 query
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@app.get("/archive/facets")
+async def archive_facets():
+    return await run_in_threadpool(_get_archive().facets)
+
+
+@app.get("/archive/{rfp_id}")
+async def archive_get(rfp_id: int):
+    analysis = await run_in_threadpool(_get_archive().get, rfp_id)
+    if analysis is None:
+        raise HTTPException(status_code=404, detail=f"No archived RFP {rfp_id}.")
+    return analysis
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run("service.api:app", host="0.0.0.0", port=int(os.getenv("PORT", "8000")),
+                workers=int(os.getenv("PLANGENIE_WORKERS", "4")))
@@ -0,0 +1,101 @@
+import json
+import time
+import requests
+
+
+class PlanGenieClient:
+    """Thin HTTP client for service/api.py; retries when the server applies backpressure (503)."""
+
+    def __init__(self, base_url, timeout=180, max_retries=5):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.session = requests.Session()
+
+    def _request(self, method, path, payload=None, stream=False):
+        for attempt in range(self.max_retries + 1):
+            response = self.session.request(method, f"{self.base_url}{path}", json=payload,
+                                            timeout=self.timeout, stream=stream)
+            if response.status_code != 503 or attempt == self.max_retries:
+                response.raise_for_status()
+                return response
+            time.sleep(float(response.headers.get("Retry-After", 2 ** attempt)))
+
+    def _post(self, path, payload, stream=False):
+        return self._request("POST", path, payload, stream=stream)
+
+    def analyze(self, file_name, text):
+        """Analysis JSON for one RFP; includes "Doc_Id" for later ask/skill-gap/export calls."""
+        return self._post("/analyze", {"file_name": file_name, "text": text}).json()
+
+    def analyze_batch(self, documents):
+        """Yield analyses as the server finishes them. documents: list of (file_name, text)."""
+        payload = {"documents": [{"file_name": n, "text": t} for n, t in documents]}
+        response = self._post("/analyze/batch", payload, stream=True)
+        for line in response.iter_lines():
+            if line:
+                yield json.loads(line)
+
+    def ask(self, question, doc_ids, top_k=3):
+        """Returns (answer, context_chunks)."""
+        response = self._post("/ask", {"question": question, "doc_ids": doc_ids, "top_k": top_k}, stream=True)
+        result = {}
+        for line in response.iter_lines():
+            if line:
+                result.update(json.loads(line))
+        return result.get("answer", ""), result.get("context", [])
+
+    def ask_compare(self, question, doc_ids, top_k=3):
+        """Per-RFP answers computed server-side: [{"RFP_File", "Answer", "Context"}, ...]."""
+        payload = {"question": question, "doc_ids": doc_ids, "top_k": top_k}
+        return self._post("/ask/compare", payload).json()
+
+    def skill_gap(self, doc_id=None, skills=None):
+        return self._post("/skill-gap", {"doc_id": doc_id, "skills": skills}).json()
+
+    def export(self, doc_ids, save_path, fmt="json"):
+        response = self._post("/export", {"doc_ids": doc_ids, "format": fmt}, stream=True)
+        with open(save_path, "wb") as f:
+            for chunk in response.iter_content(chunk_size=1 << 16):
+                f.write(chunk)
+        return save_path
+
+    def archive_search(self, **filters):
+        """RFP_Archive.search on the server's shared archive; same filters and result shape."""
+        return self._post("/archive/search", filters).json()
+
+    def archive_facets(self):
+        return self._request("GET", "/archive/facets").json()
+
+    def archive_get(self, rfp_id):
+        return self._request("GET", f"/archive/{rfp_id}").json()
+
+
+class RemoteArchive:
+    """
+    The read side of RFP_Archive (search/facets/get) served by the API, so a
+    thin client browses the service's shared archive instead of a local one.
+    Invalid full-text queries raise ValueError.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    def search(self, page=1, page_size=20, **filters):
+        try:
+            return self.client.archive_search(page=page, page_size=page_size, **filters)
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 422:
+                raise ValueError(e.response.json().get("detail", "Invalid search query")) from e
+            raise
+
+    def facets(self):
+        return self.client.archive_facets()
+
+    def get(self, rfp_id):
+        try:
+            return self.client.archive_get(rfp_id)
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return None
+            raise
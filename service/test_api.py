@@ -0,0 +1,142 @@
+import json
+import os
+
+import pytest
+
+os.environ.setdefault("GROQ_API_KEY", "test")
+os.environ.setdefault("Huggingface_API", "test")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from service import api  # noqa: E402
+
+RFP = """Project Title: Citizen Portal
+Scope of Work
+- Online services for citizens
+Timeline
+- Phase 1: Design (2 weeks)
+- Phase 2: Build (2 months)
+Budget: ₹40 lakh
+"""
+
+
+class FakeLLM:
+    def __init__(self):
+        self.prompts = []
+
+    def __call__(self, prompt, max_tokens=500, **kwargs):
+        self.prompts.append(prompt)
+        if "JSON" not in prompt:
+            return "The portal must be live in 10 weeks."
+        return json.dumps({"Project_Type": "Portal", "Required_Skills": ["Python"],
+                           "Tasks_Roles": [{"Role": "Developer", "Tasks": ["Build"]}]})
+
+
+@pytest.fixture
+def llm(tmp_path, monkeypatch):
+    fake = FakeLLM()
+    monkeypatch.setattr(api, "llm_generate", fake)
+    monkeypatch.setattr(api, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(api, "ARCHIVE_DB", str(tmp_path / "archive.db"))
+    monkeypatch.setattr(api, "DEDUP_DB", str(tmp_path / "dedup.db"))
+    monkeypatch.setattr(api, "_archive", None)
+    monkeypatch.setattr(api, "_dedup_index", None)
+    monkeypatch.setattr(api, "retrieve_context", lambda question, doc_ids, top_k: ["portal.txt:\nlive in 10 weeks"])
+    yield fake
+    for store in (api._archive, api._dedup_index):
+        if store is not None:
+            store.close()
+
+
+@pytest.fixture
+def client(llm):
+    return TestClient(api.app)
+
+
+def analyze(client, text=RFP, name="portal.txt"):
+    response = client.post("/analyze", json={"file_name": name, "text": text})
+    assert response.status_code == 200
+    return response.json()
+
+
+def ndjson(response):
+    return [json.loads(line) for line in response.iter_lines() if line]
+
+
+# -----------------------------
+# Analysis & cache
+# -----------------------------
+def test_second_analysis_is_a_cache_hit(client, llm):
+    first = analyze(client)
+    again = analyze(client, name="copy.txt")
+    assert first["Cached"] is False and again["Cached"] is True
+    assert again["Doc_Id"] == first["Doc_Id"] and again["RFP_File"] == "copy.txt"
+    assert len(llm.prompts) == 1
+
+
+def test_batch_streams_one_line_per_document(client):
+    docs = [{"file_name": f"{i}.txt", "text": f"{RFP}\nLot {i} " + " ".join(f"w{i}x{k}" for k in range(200))}
+            for i in range(3)]
+    with client.stream("POST", "/analyze/batch", json={"documents": docs}) as response:
+        lines = ndjson(response)
+    assert sorted(line["RFP_File"] for line in lines) == ["0.txt", "1.txt", "2.txt"]
+
+
+# -----------------------------
+# Errors
+# -----------------------------
+def test_validation_errors_are_422(client):
+    assert client.post("/analyze/batch", json={"documents": []}).status_code == 422
+    assert client.post("/ask", json={"question": "q", "doc_ids": []}).status_code == 422
+    assert client.post("/skill-gap", json={}).status_code == 422
+    doc_id = analyze(client)["Doc_Id"]
+    assert client.post("/export", json={"doc_ids": [doc_id], "format": "docx"}).status_code == 422
+
+
+def test_unknown_documents_are_404(client):
+    assert client.post("/ask", json={"question": "q", "doc_ids": ["nope"]}).status_code == 404
+    assert client.post("/export", json={"doc_ids": ["nope"]}).status_code == 404
+    assert client.post("/skill-gap", json={"doc_id": "nope"}).status_code == 404
+
+
+def test_oversized_batch_is_413(client, monkeypatch):
+    monkeypatch.setattr(api, "MAX_BATCH", 2)
+    docs = [{"file_name": f"{i}.txt", "text": RFP} for i in range(3)]
+    assert client.post("/analyze/batch", json={"documents": docs}).status_code == 413
+
+
+# -----------------------------
+# Backpressure
+# -----------------------------
+def test_saturated_worker_returns_503_with_retry_after(client, llm, monkeypatch):
+    monkeypatch.setattr(api, "_inflight", api.MAX_INFLIGHT)
+    response = client.post("/analyze", json={"file_name": "portal.txt", "text": RFP})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(api.RETRY_AFTER_SECONDS)
+    assert llm.prompts == []
+
+
+def test_inflight_returns_to_zero_after_streams(client):
+    doc_id = analyze(client)["Doc_Id"]
+    with client.stream("POST", "/ask", json={"question": "When?", "doc_ids": [doc_id]}) as response:
+        events = ndjson(response)
+    assert [list(e) for e in events] == [["context"], ["answer"]]
+
+    docs = [{"file_name": f"{i}.txt", "text": f"{RFP}\nLot {i}"} for i in range(6)]
+    with client.stream("POST", "/analyze/batch", json={"documents": docs}) as response:
+        assert len(ndjson(response)) == 6
+    assert client.get("/health").json()["inflight"] == 0
+
+
+# -----------------------------
+# Archive
+# -----------------------------
+def test_archive_endpoints(client):
+    analyze(client)
+    result = client.post("/archive/search", json={"text": "citizens"}).json()
+    assert result["total"] == 1
+    rfp_id = result["results"][0]["id"]
+    assert client.get(f"/archive/{rfp_id}").json()["Project_Type"] == "Citizen Portal"
+    assert "Python" in client.get("/archive/facets").json()["skills"]
+    assert client.get("/archive/999").status_code == 404
+    assert client.post("/archive/search", json={"text": '"unbalanced'}).status_code == 422
@@ -0,0 +1,247 @@
+import os
+import json
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rfps (
+    id              INTEGER PRIMARY KEY,
+    rfp_file        TEXT NOT NULL,
+    content_hash    TEXT UNIQUE NOT NULL,
+    project_type    TEXT,
+    budget          REAL,
+    currency        TEXT,
+    duration_days   INTEGER,
+    analysis_mode   TEXT,
+    analysis_json   TEXT NOT NULL,
+    archived_at     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_rfps_project_type ON rfps(project_type COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_rfps_budget ON rfps(budget);
+CREATE INDEX IF NOT EXISTS idx_rfps_duration ON rfps(duration_days);
+
+CREATE TABLE IF NOT EXISTS rfp_skills (
+    rfp_id  INTEGER NOT NULL REFERENCES rfps(id) ON DELETE CASCADE,
+    skill   TEXT NOT NULL COLLATE NOCASE,
+    PRIMARY KEY (skill, rfp_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_rfp_skills_rfp ON rfp_skills(rfp_id);
+
+CREATE TABLE IF NOT EXISTS rfp_roles (
+    rfp_id  INTEGER NOT NULL REFERENCES rfps(id) ON DELETE CASCADE,
+    role    TEXT NOT NULL COLLATE NOCASE,
+    PRIMARY KEY (role, rfp_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_rfp_roles_rfp ON rfp_roles(rfp_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS rfp_text USING fts5(
+    rfp_file, project_type, body, tokenize = 'porter unicode61'
+);
+"""
+
+SUMMARY_COLUMNS = ["id", "rfp_file", "project_type", "budget", "currency", "duration_days", "archived_at"]
+
+
+def _split_skills(skills):
+    """Required_Skills entries are often comma-separated ("React, Django")."""
+    flat = []
+    for s in skills or []:
+        flat.extend(x.strip() for x in str(s).split(",") if x.strip())
+    return sorted(set(flat), key=str.lower)
+
+
+class RFP_Archive:
+    """
+    SQLite archive of past RFP analyses and their source text.
+
+    Structured fields live in indexed columns and skill/role junction tables;
+    the source text is searchable through FTS5. Queries never load the stored
+    analysis JSON unless explicitly requested via get().
+
+    Each thread gets its own connection, and writes take SQLite's write lock
+    up front (BEGIN IMMEDIATE), so Streamlit sessions, service threads and
+    worker processes can share one database file.
+    """
+
+    def __init__(self, db_path="data/archive/rfp_archive.db", timeout=30):
+        self.db_path = db_path
+        self.timeout = timeout
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.conn.executescript(SCHEMA)
+        columns = [r["name"] for r in self.conn.execute("PRAGMA table_info(rfps)")]
+        if "analysis_mode" not in columns:
+            self.conn.execute("ALTER TABLE rfps ADD COLUMN analysis_mode TEXT")
+
+    @property
+    def conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _write(self):
+        """One write transaction; waits up to timeout seconds for other writers."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    # -----------------------------
+    # Ingestion
+    # -----------------------------
+    def ingest(self, analysis, text):
+        """Archive one analysis with its source text. Re-ingesting the same text replaces it."""
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        analysis = {k: v for k, v in analysis.items() if k != "raw_text"}
+        cost = analysis.get("Cost_Estimate", {})
+        budget = cost.get("Amount")  # only INR amounts are stored, so budget filters compare like with like
+        duration = analysis.get("Timeline", {}).get("Total_Duration_Days")
+        roles = sorted({r.get("Role") for r in analysis.get("Tasks_Roles", []) if r.get("Role")})
+
+        with self._write() as conn:
+            old = conn.execute("SELECT id FROM rfps WHERE content_hash = ?", (digest,)).fetchone()
+            if old:
+                self._delete(old["id"])
+            cur = conn.execute(
+                "INSERT INTO rfps (rfp_file, content_hash, project_type, budget, currency, "
+                "duration_days, analysis_mode, analysis_json, archived_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    analysis.get("RFP_File", ""), digest, analysis.get("Project_Type"),
+                    budget if isinstance(budget, (int, float)) and cost.get("Currency", "INR") == "INR" else None,
+                    cost.get("Currency"),
+                    duration if isinstance(duration, (int, float)) else None,
+                    analysis.get("Analysis_Mode"), json.dumps(analysis, ensure_ascii=False), datetime.now().isoformat(timespec="seconds"),
+                ),
+            )
+            rfp_id = cur.lastrowid
+            conn.executemany("INSERT OR IGNORE INTO rfp_skills VALUES (?, ?)",
+                             [(rfp_id, s) for s in _split_skills(analysis.get("Required_Skills"))])
+            conn.executemany("INSERT OR IGNORE INTO rfp_roles VALUES (?, ?)",
+                             [(rfp_id, r) for r in roles])
+            conn.execute("INSERT INTO rfp_text (rowid, rfp_file, project_type, body) VALUES (?, ?, ?, ?)",
+                         (rfp_id, analysis.get("RFP_File", ""), analysis.get("Project_Type") or "", text))
+        return rfp_id
+
+    def contains(self, text, modes=None):
+        """Whether text is archived; with modes, only if its analysis was made in one of them."""
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        sql, params = "SELECT 1 FROM rfps WHERE content_hash = ?", [digest]
+        if modes is not None:
+            sql += f" AND analysis_mode IN ({', '.join('?' * len(modes))})"
+            params += list(modes)
+        return self.conn.execute(sql, params).fetchone() is not None
+
+    def ingest_folder(self, json_folder="data/processed_json", text_folder="data/processed"):
+        """Archive every <name>.json in json_folder whose <name>.txt exists in text_folder."""
+        count = 0
+        for name in sorted(os.listdir(json_folder)):
+            text_path = os.path.join(text_folder, os.path.splitext(name)[0] + ".txt")
+            if not name.endswith(".json") or not os.path.exists(text_path):
+                continue
+            with open(os.path.join(json_folder, name), "r", encoding="utf-8") as f:
+                analysis = json.load(f)
+            with open(text_path, "r", encoding="utf-8") as f:
+                text = f.read()
+            if isinstance(analysis, dict):
+                analysis.setdefault("RFP_File", os.path.basename(text_path))
+                self.ingest(analysis, text)
+                count += 1
+        return count
+
+    def _delete(self, rfp_id):
+        self.conn.execute("DELETE FROM rfp_text WHERE rowid = ?", (rfp_id,))
+        self.conn.execute("DELETE FROM rfps WHERE id = ?", (rfp_id,))
+
+    def delete(self, rfp_id):
+        with self._write():
+            self._delete(rfp_id)
+
+    # -----------------------------
+    # Queries
+    # -----------------------------
+    def search(self, text=None, skills=None, roles=None, project_type=None,
+               min_budget=None, max_budget=None, min_duration=None, max_duration=None,
+               page=1, page_size=20):
+        """
+        Filtered, paginated search.
+
+        text:          FTS5 query over the RFP text (e.g. 'kubernetes AND "data privacy"')
+        skills/roles:  every listed skill/role must be present (case-insensitive)
+        project_type:  substring match on the project type
+
+        Returns {"total", "page", "page_size", "results"}; results are ranked by
+        full-text relevance when text is given, else newest first.
+        """
+        joins, where, params = [], [], []
+
+        if text:
+            joins.append("JOIN rfp_text ON rfp_text.rowid = rfps.id")
+            where.append("rfp_text MATCH ?")
+            params.append(text)
+        for skill in skills or []:
+            where.append("EXISTS (SELECT 1 FROM rfp_skills s WHERE s.rfp_id = rfps.id AND s.skill = ?)")
+            params.append(skill)
+        for role in roles or []:
+            where.append("EXISTS (SELECT 1 FROM rfp_roles r WHERE r.rfp_id = rfps.id AND r.role = ?)")
+            params.append(role)
+        if project_type:
+            where.append("rfps.project_type LIKE ?")
+            params.append(f"%{project_type}%")
+        for column, op, value in [("budget", ">=", min_budget), ("budget", "<=", max_budget),
+                                  ("duration_days", ">=", min_duration), ("duration_days", "<=", max_duration)]:
+            if value is not None:
+                where.append(f"rfps.{column} {op} ?")
+                params.append(value)
+
+        base = "FROM rfps " + " ".join(joins) + (" WHERE " + " AND ".join(where) if where else "")
+        total = self.conn.execute(f"SELECT COUNT(*) {base}", params).fetchone()[0]
+
+        columns = ", ".join(f"rfps.{c}" for c in SUMMARY_COLUMNS)
+        order = "ORDER BY bm25(rfp_text)" if text else "ORDER BY rfps.archived_at DESC, rfps.id DESC"
+        if text:
+            columns += ", snippet(rfp_text, 2, '**', '**', '…', 12) AS snippet"
+        page = max(1, int(page))
+        rows = self.conn.execute(
+            f"SELECT {columns} {base} {order} LIMIT ? OFFSET ?",
+            params + [page_size, (page - 1) * page_size],
+        ).fetchall()
+
+        return {"total": total, "page": page, "page_size": page_size,
+                "results": [dict(r) for r in rows]}
+
+    def get(self, rfp_id):
+        """Full stored analysis for one archived RFP."""
+        row = self.conn.execute("SELECT analysis_json FROM rfps WHERE id = ?", (rfp_id,)).fetchone()
+        return json.loads(row["analysis_json"]) if row else None
+
+    def skills(self, rfp_id):
+        return [r["skill"] for r in self.conn.execute(
+            "SELECT skill FROM rfp_skills WHERE rfp_id = ? ORDER BY skill", (rfp_id,))]
+
+    def facets(self, limit=50):
+        """Most common skills and roles, for populating filter widgets."""
+        skills = self.conn.execute(
+            "SELECT skill, COUNT(*) AS n FROM rfp_skills GROUP BY skill ORDER BY n DESC LIMIT ?", (limit,)
+        ).fetchall()
+        roles = self.conn.execute(
+            "SELECT role, COUNT(*) AS n FROM rfp_roles GROUP BY role ORDER BY n DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return {"skills": [r["skill"] for r in skills], "roles": [r["role"] for r in roles]}
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
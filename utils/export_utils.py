@@ -16,21 +16,19 @@ def export_json(all_analyses, output_folder="data/processed_json", base_name="mu
 def export_excel(all_analyses, output_folder="data/processed_json", base_name="multi_rfp_analysis"):
     os.makedirs(output_folder, exist_ok=True)
     save_path = os.path.join(output_folder, base_name + ".xlsx")
-    writer = pd.ExcelWriter(save_path, engine='xlsxwriter')
-    
-    for analysis in all_analyses:
-        sheet_name = analysis["RFP_File"][:31]  # Excel sheet name limit
-        rows = []
-        rows.append(["Project Type", analysis.get("Project_Type", "")])
-        rows.append(["Scope", str(analysis.get("Scope", ""))])
-        rows.append(["Deliverables", ", ".join(analysis.get("Deliverables", []))])
-        rows.append(["Required Skills", ", ".join(analysis.get("Required_Skills", []))])
-        rows.append(["Total Duration", analysis.get("Timeline", {}).get("Total_Duration_Days", 0)])
-        rows.append(["Total Budget", analysis.get("Cost_Estimate", {}).get("Amount", 0)])
-        df = pd.DataFrame(rows, columns=["Field", "Value"])
-        df.to_excel(writer, sheet_name=sheet_name, index=False)
-    
-    writer.save()
+    with pd.ExcelWriter(save_path, engine='openpyxl') as writer:
+        for analysis in all_analyses:
+            sheet_name = analysis["RFP_File"][:31]  # Excel sheet name limit
+            rows = []
+            rows.append(["Project Type", analysis.get("Project_Type", "")])
+            rows.append(["Scope", str(analysis.get("Scope", ""))])
+            rows.append(["Deliverables", ", ".join(analysis.get("Deliverables", []))])
+            rows.append(["Required Skills", ", ".join(analysis.get("Required_Skills", []))])
+            rows.append(["Total Duration", analysis.get("Timeline", {}).get("Total_Duration_Days", 0)])
+            rows.append(["Total Budget", analysis.get("Cost_Estimate", {}).get("Amount", 0)])
+            df = pd.DataFrame(rows, columns=["Field", "Value"])
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+
     return save_path
 
 def export_pdf(all_analyses, output_folder="data/processed_json", base_name="multi_rfp_analysis"):
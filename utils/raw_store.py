@@ -0,0 +1,197 @@
+import io
+import os
+import json
+import mmap
+import hashlib
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from filelock import FileLock
+
+CHUNK_SIZE = 1 << 20  # 1 MiB
+
+
+class _MmapFile(io.RawIOBase):
+    """Seekable file-like view over an mmap (mmap has no seekable() before Python 3.13)."""
+
+    def __init__(self, mm):
+        self.mm = mm
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.mm.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        self.mm.seek(offset, whence)
+        return self.mm.tell()
+
+    def tell(self):
+        return self.mm.tell()
+
+
+class RawDocumentStore:
+    """
+    Content-addressed store for uploaded RFP files.
+
+    Uploads are hashed in chunks and only streamed to disk when their SHA-256
+    is new, so re-uploads cost no writes and same-named files never
+    overwrite each other. Extracted text is cached next to the object.
+
+    Layout:
+        objects/<aa>/<sha256><ext>   original file
+        text/<aa>/<sha256>.txt       extracted text
+        index.json                   {"names": {name: [sha256, ...]}, "objects": {sha256: {...}}}
+    """
+
+    def __init__(self, root="data/raw_store"):
+        self.root = root
+        self.index_path = os.path.join(root, "index.json")
+        self.lock = FileLock(self.index_path + ".lock")
+        self._index_cache = None  # ((inode, mtime, size) of index.json, parsed index)
+        os.makedirs(os.path.join(root, "tmp"), exist_ok=True)
+
+    # -----------------------------
+    # Paths & Index
+    # -----------------------------
+    def _path(self, kind, digest, ext):
+        folder = os.path.join(self.root, kind, digest[:2])
+        os.makedirs(folder, exist_ok=True)
+        return os.path.join(folder, digest + ext)
+
+    def _load_index(self):
+        """Freshly parsed index, safe to modify."""
+        if not os.path.exists(self.index_path):
+            return {"names": {}, "objects": {}}
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _read_index(self):
+        """
+        Parsed index for lookups, re-read only when index.json changes on disk
+        (every write replaces the file, so its inode changes). Do not modify it.
+        """
+        try:
+            st = os.stat(self.index_path)
+        except FileNotFoundError:
+            return {"names": {}, "objects": {}}
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        cached = self._index_cache
+        if cached is None or cached[0] != key:
+            cached = self._index_cache = (key, self._load_index())
+        return cached[1]
+
+    def _write_index(self, index):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+
+    def lookup(self, name):
+        """Hashes stored under a file name, oldest first."""
+        return self._read_index()["names"].get(name, [])
+
+    def info(self, digest):
+        return self._read_index()["objects"].get(digest)
+
+    def path(self, digest):
+        return self._path("objects", digest, self.info(digest)["ext"])
+
+    # -----------------------------
+    # Storing
+    # -----------------------------
+    def put(self, fileobj, name, chunk_size=CHUNK_SIZE):
+        """
+        Store fileobj under its SHA-256. Returns (sha256, is_new).
+
+        The file is hashed in chunks first and only copied to disk when the
+        content is new, so re-uploads cost one read and no writes. fileobj
+        must be seekable (Streamlit's UploadedFile is an in-memory buffer).
+        """
+        ext = os.path.splitext(name)[1].lower()
+        hasher = hashlib.sha256()
+        size = 0
+        fileobj.seek(0)
+        for chunk in iter(lambda: fileobj.read(chunk_size), b""):
+            hasher.update(chunk)
+            size += len(chunk)
+        digest = hasher.hexdigest()
+
+        with self.lock:
+            index = self._load_index()
+            is_new = digest not in index["objects"]
+            if is_new:
+                self._write_object(fileobj, digest, ext, chunk_size)
+                index["objects"][digest] = {"ext": ext, "size": size, "names": [],
+                                            "stored_at": datetime.now().isoformat(timespec="seconds")}
+            entry = index["objects"][digest]
+            hashes = index["names"].setdefault(name, [])
+            if is_new or name not in entry["names"] or digest not in hashes:
+                if name not in entry["names"]:
+                    entry["names"].append(name)
+                if digest not in hashes:
+                    hashes.append(digest)
+                self._write_index(index)
+        return digest, is_new
+
+    def _write_object(self, fileobj, digest, ext, chunk_size):
+        """Stream fileobj to objects/ via a temp file, so readers never see a partial object."""
+        fileobj.seek(0)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.join(self.root, "tmp"))
+        try:
+            with os.fdopen(fd, "wb") as out:
+                for chunk in iter(lambda: fileobj.read(chunk_size), b""):
+                    out.write(chunk)
+            os.replace(tmp_path, self._path("objects", digest, ext))
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    # -----------------------------
+    # Reading
+    # -----------------------------
+    @contextmanager
+    def open_mmap(self, digest, kind="objects", ext=None):
+        """Memory-map a stored file read-only; yields None for empty files."""
+        path = self._path(kind, digest, ext if ext is not None else self.info(digest)["ext"])
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                yield None
+                return
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                yield mm
+            finally:
+                mm.close()
+
+    def has_text(self, digest):
+        return os.path.exists(self._path("text", digest, ".txt"))
+
+    def extract_text(self, digest, reader):
+        """
+        Extract text once per content hash with reader(file_like) and cache it.
+        Returns the path of the cached text file.
+        """
+        text_path = self._path("text", digest, ".txt")
+        if not os.path.exists(text_path):
+            with self.open_mmap(digest) as mm:
+                text = reader(io.BufferedReader(_MmapFile(mm))) if mm is not None else ""
+            tmp_path = f"{text_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, text_path)
+        return text_path
+
+    def preview(self, digest, n_chars=500):
+        """First n_chars of the extracted text, read via mmap without loading the whole file."""
+        with self.open_mmap(digest, kind="text", ext=".txt") as mm:
+            if mm is None:
+                return ""
+            # UTF-8 uses at most 4 bytes per character
+            return mm[:n_chars * 4].decode("utf-8", errors="ignore")[:n_chars]
@@ -0,0 +1,141 @@
+import threading
+
+import pytest
+
+from utils.archive_store import RFP_Archive
+
+ANALYSES = [
+    ({"RFP_File": "portal.txt", "Project_Type": "Citizen Portal", "Analysis_Mode": "full",
+      "Required_Skills": ["Python, Django", "PostgreSQL"],
+      "Tasks_Roles": [{"Role": "Backend Developer", "Tasks": ["APIs"]}],
+      "Cost_Estimate": {"Amount": 500000, "Currency": "INR"},
+      "Timeline": {"Total_Duration_Days": 90}},
+     "The vendor shall build a citizen portal on Kubernetes with strict data privacy controls."),
+    ({"RFP_File": "app.txt", "Project_Type": "Mobile App", "Analysis_Mode": "hybrid",
+      "Required_Skills": ["Flutter", "python"],
+      "Tasks_Roles": [{"Role": "Mobile Developer", "Tasks": ["Screens"]}],
+      "Cost_Estimate": {"Amount": 200000, "Currency": "INR"},
+      "Timeline": {"Total_Duration_Days": 45}},
+     "A mobile application for field staff, with offline sync and data privacy."),
+    ({"RFP_File": "erp.txt", "Project_Type": "ERP Rollout", "Analysis_Mode": "offline",
+      "Required_Skills": ["SAP"],
+      "Tasks_Roles": [{"Role": "Consultant", "Tasks": ["Rollout"]}],
+      "Cost_Estimate": {"Amount": 2000000, "Currency": "INR"},
+      "Timeline": {"Total_Duration_Days": 365}},
+     "ERP rollout across twelve districts, hosted on premises."),
+]
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = RFP_Archive(str(tmp_path / "archive.db"))
+    for analysis, text in ANALYSES:
+        archive.ingest(analysis, text)
+    yield archive
+    archive.close()
+
+
+def files(result):
+    return sorted(r["rfp_file"] for r in result["results"])
+
+
+# -----------------------------
+# Full-text search
+# -----------------------------
+def test_fts_matches_stemmed_terms_and_returns_snippets(archive):
+    result = archive.search(text="privacy")
+    assert files(result) == ["app.txt", "portal.txt"]
+    assert all("**privacy**" in r["snippet"] for r in result["results"])
+
+    assert files(archive.search(text="districts")) == ["erp.txt"]
+    assert files(archive.search(text="hosting")) == ["erp.txt"]  # porter stemming
+
+
+def test_fts_boolean_query(archive):
+    assert files(archive.search(text='kubernetes AND "data privacy"')) == ["portal.txt"]
+
+
+# -----------------------------
+# Junction-table filters
+# -----------------------------
+def test_skills_are_split_and_case_insensitive(archive):
+    assert files(archive.search(skills=["django"])) == ["portal.txt"]
+    assert files(archive.search(skills=["Python"])) == ["app.txt", "portal.txt"]
+    assert files(archive.search(skills=["python", "flutter"])) == ["app.txt"]
+    assert archive.search(skills=["Rust"])["total"] == 0
+
+
+def test_role_and_project_type_filters(archive):
+    assert files(archive.search(roles=["consultant"])) == ["erp.txt"]
+    assert files(archive.search(project_type="portal")) == ["portal.txt"]
+
+
+def test_budget_and_duration_ranges(archive):
+    assert files(archive.search(min_budget=300000)) == ["erp.txt", "portal.txt"]
+    assert files(archive.search(max_budget=600000, min_duration=60)) == ["portal.txt"]
+    assert files(archive.search(text="privacy", max_duration=50)) == ["app.txt"]
+
+
+def test_budget_filters_skip_unconverted_currencies(archive):
+    archive.ingest({"RFP_File": "uk.txt", "Cost_Estimate": {"Amount": 900000, "Currency": "GBP"}}, "uk tender")
+    assert files(archive.search(min_budget=300000)) == ["erp.txt", "portal.txt"]
+    assert archive.search(text="uk")["results"][0]["currency"] == "GBP"
+
+
+def test_pagination(archive):
+    first = archive.search(page=1, page_size=2)
+    second = archive.search(page=2, page_size=2)
+    assert first["total"] == second["total"] == 3
+    assert len(first["results"]) == 2 and len(second["results"]) == 1
+    assert {r["id"] for r in first["results"]}.isdisjoint(r["id"] for r in second["results"])
+
+
+def test_facets_and_get(archive):
+    facets = archive.facets()
+    assert facets["skills"][0].lower() == "python"
+    rfp_id = archive.search(text="districts")["results"][0]["id"]
+    assert archive.get(rfp_id)["Project_Type"] == "ERP Rollout"
+    assert archive.skills(rfp_id) == ["SAP"]
+
+
+# -----------------------------
+# Updates
+# -----------------------------
+def test_reingest_replaces_and_delete_removes_everywhere(archive):
+    analysis, text = ANALYSES[0]
+    archive.ingest({**analysis, "Project_Type": "Citizen Portal v2"}, text)
+    assert archive.search()["total"] == 3
+    assert archive.search(project_type="v2")["total"] == 1
+
+    rfp_id = archive.search(text="kubernetes")["results"][0]["id"]
+    archive.delete(rfp_id)
+    assert archive.search(text="kubernetes")["total"] == 0
+    assert archive.search(skills=["django"])["total"] == 0
+
+
+def test_contains_respects_analysis_mode(archive):
+    _, text = ANALYSES[2]  # archived offline
+    assert archive.contains(text)
+    assert archive.contains(text, ["offline", "hybrid", "full"])
+    assert not archive.contains(text, ["hybrid", "full"])
+
+
+def test_concurrent_ingest_keeps_tables_in_sync(tmp_path):
+    archive = RFP_Archive(str(tmp_path / "shared.db"))
+
+    def ingest_many(worker):
+        for j in range(20):
+            archive.ingest({"RFP_File": f"{worker}.txt", "Required_Skills": ["Python"]}, f"shared text {j % 5}")
+            archive.ingest({"RFP_File": f"{worker}.txt"}, f"unique text {worker} {j}")
+
+    threads = [threading.Thread(target=ingest_many, args=(w,)) for w in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    conn = archive.conn
+    assert conn.execute("SELECT COUNT(*) FROM rfps").fetchone()[0] == 5 + 6 * 20
+    assert conn.execute("SELECT COUNT(*) FROM rfp_text").fetchone()[0] == 5 + 6 * 20
+    assert archive.search(skills=["python"])["total"] == 5
+    archive.close()
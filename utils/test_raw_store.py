@@ -0,0 +1,108 @@
+import io
+import os
+
+import pytest
+
+from utils.raw_store import RawDocumentStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return RawDocumentStore(str(tmp_path / "raw_store"))
+
+
+def objects(store):
+    return [f for _, _, files in os.walk(os.path.join(store.root, "objects")) for f in files]
+
+
+def decode(file_like):
+    return file_like.read().decode("utf-8").upper()
+
+
+# -----------------------------
+# Storing
+# -----------------------------
+def test_same_content_under_two_names_is_stored_once(store):
+    digest, is_new = store.put(io.BytesIO(b"same bytes"), "a.txt")
+    again, is_new_again = store.put(io.BytesIO(b"same bytes"), "b.TXT")
+
+    assert again == digest and is_new and not is_new_again
+    assert len(objects(store)) == 1
+    assert store.info(digest)["names"] == ["a.txt", "b.TXT"]
+    assert store.lookup("b.TXT") == [digest]
+
+
+def test_same_name_with_new_content_does_not_overwrite(store):
+    first, _ = store.put(io.BytesIO(b"version one"), "rfp.txt")
+    second, _ = store.put(io.BytesIO(b"version two"), "rfp.txt")
+
+    assert first != second
+    assert store.lookup("rfp.txt") == [first, second]
+    with open(store.path(first), "rb") as f:
+        assert f.read() == b"version one"
+    with open(store.path(second), "rb") as f:
+        assert f.read() == b"version two"
+
+
+def test_chunked_hashing_matches_whole_file(store):
+    data = os.urandom(10_000)
+    digest, _ = store.put(io.BytesIO(data), "big.bin", chunk_size=1024)
+    assert digest == store.put(io.BytesIO(data), "big2.bin")[0]
+    assert store.info(digest)["size"] == 10_000
+
+
+# -----------------------------
+# Extraction & reading
+# -----------------------------
+def test_extraction_is_cached_per_hash(store):
+    calls = []
+
+    def reader(f):
+        calls.append(1)
+        return decode(f)
+
+    digest, _ = store.put(io.BytesIO(b"scope of work"), "a.txt")
+    store.put(io.BytesIO(b"scope of work"), "copy.txt")
+    path = store.extract_text(digest, reader)
+    assert store.extract_text(digest, reader) == path
+    assert len(calls) == 1 and store.has_text(digest)
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == "SCOPE OF WORK"
+
+
+def test_mmap_preview(store):
+    digest, _ = store.put(io.BytesIO("Budget: ₹50 lakh. ".encode("utf-8") * 100), "rfp.txt")
+    store.extract_text(digest, lambda f: f.read().decode("utf-8"))
+    assert store.preview(digest, n_chars=10) == "Budget: ₹5"
+
+    with store.open_mmap(digest) as mm:
+        assert mm[:6] == b"Budget"
+
+
+def test_empty_file(store):
+    digest, _ = store.put(io.BytesIO(b""), "empty.txt")
+    with store.open_mmap(digest) as mm:
+        assert mm is None
+    calls = []
+    store.extract_text(digest, lambda f: calls.append(1) or "unused")
+    assert calls == [] and store.preview(digest) == ""
+
+
+# -----------------------------
+# Index
+# -----------------------------
+def test_index_is_parsed_only_when_it_changes(store, monkeypatch):
+    digest, _ = store.put(io.BytesIO(b"abc"), "a.txt")
+    store.info(digest)
+
+    loads = []
+    load_index = store._load_index
+    monkeypatch.setattr(store, "_load_index", lambda: loads.append(1) or load_index())
+    for _ in range(5):
+        store.path(digest)
+        store.lookup("a.txt")
+    assert loads == []
+
+    other = RawDocumentStore(store.root)  # e.g. another worker process
+    new_digest, _ = other.put(io.BytesIO(b"def"), "b.txt")
+    assert store.info(new_digest)["names"] == ["b.txt"]